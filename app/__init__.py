@@ -9,7 +9,14 @@ from flask_login import LoginManager
 from dotenv import load_dotenv
 
 from config.settings import get_settings
-from models import get_user_by_id, init_db
+from .json_provider import install_json_provider
+from models import (
+    begin_request_cache,
+    end_request_cache,
+    end_request_transaction,
+    get_user_by_id,
+    init_db,
+)
 
 _ENV_LOADED = False
 
@@ -54,6 +61,8 @@ def create_app() -> Flask:
     from models import reset_engine
     reset_engine()
     
+    # .env may have just been (re)loaded; drop any settings memoized before that
+    get_settings.cache_clear()
     settings = get_settings()
 
     # Set template and static folders to project root directories
@@ -62,6 +71,7 @@ def create_app() -> Flask:
     static_dir = os.path.join(base_dir, "static")
     app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
     app.config["SECRET_KEY"] = settings.SECRET_KEY
+    install_json_provider(app)
     
     # Configure session cookies for HTTPS
     app.config["SESSION_COOKIE_SECURE"] = True  # Only send cookies over HTTPS
@@ -72,26 +82,17 @@ def create_app() -> Flask:
     login_manager.init_app(app)
     init_db()
 
-    # CRITICAL: Reset database connection before every request to ensure we use PostgreSQL
-    # This prevents gunicorn workers from using cached SQLite connections
-    # This applies to ALL users and ALL requests universally
+    # DAL functions borrow pooled connections per call; the shared
+    # get_connection() connection is only used for ad-hoc queries, so just
+    # make sure no request leaves a transaction open on it.
     @app.before_request
-    def reset_db_connection():
-        """Reset database connection before each request to ensure correct database is used."""
-        # Ensure environment is loaded first
-        _ensure_env_loaded()
-        # Then reset the connection
-        from models import reset_engine
-        reset_engine()
-        # Verify we're using PostgreSQL
-        from models import get_connection, _backend
-        conn = get_connection()
-        # Check connection type directly if _backend is None (it should be set, but check as fallback)
-        is_postgres = "psycopg" in str(type(conn))
-        if _backend != "postgres" and not is_postgres:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"CRITICAL: Database backend is {_backend}, expected postgres! Connection type: {type(conn)}")
+    def start_db_request_cache() -> None:
+        begin_request_cache()
+
+    @app.teardown_request
+    def end_db_transaction(exc: Optional[BaseException]) -> None:
+        end_request_cache()
+        end_request_transaction()
 
     from .routes import bp as core_bp
 
@@ -0,0 +1,41 @@
+"""orjson-backed JSON provider for Flask responses."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_ORJSON_OPTIONS = 0
+if orjson is not None:
+    # Dates go through Flask's default hook so responses keep the HTTP date format.
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, deferring unknown types to Flask's default."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = _ORJSON_OPTIONS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            # orjson has no decoder hooks; let the json module honour them.
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install_json_provider(app) -> None:
+    """Use orjson for request/response JSON when it is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -3,12 +3,14 @@ from __future__ import annotations
 import csv
 import datetime
 import io
+import logging
 import os
 import time
 from functools import wraps
 from typing import Callable, Optional, Sequence
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from flask import (
     Blueprint,
     abort,
@@ -39,12 +41,17 @@ from app.repositories import (
 from app.repositories import uploads_repo
 from app.services.quizzes import build_quiz_questions, score_quiz_and_update
 from models import (
+    StudentStatsRow,
     create_student_profile,
     create_upload_record,
     create_user,
+    delete_user,
     ensure_baseline_words_loaded,
     ensure_student_progress_row,
+    get_educator_dashboard_stats,
     get_student_overview,
+    get_student_overview_by_username,
+    get_student_profile,
     get_upload_status,
     get_upload_by_id,
     get_user_by_identifier,
@@ -53,18 +60,18 @@ from models import (
     list_students_with_stats_for_grade,
     list_students_with_stats_for_class,
     list_students_for_educator,
-    count_pending_recommendations_for_educator,
-    count_students_for_educator,
     list_badges_for_student,
+    list_approved_words_with_mastery,
     list_word_mastery_for_student,
-    list_approved_words_for_student,
     list_uploads_for_student,
     delete_upload,
     compute_level,
+    update_upload_status,
 )
 from .security import hash_password, verify_password
 
 bp = Blueprint("core", __name__)
+logger = logging.getLogger(__name__)
 
 
 @bp.get("/")
@@ -274,6 +281,13 @@ def _parse_bool(value: object, field_name: str) -> bool:
 
 ALLOWED_UPLOAD_EXTENSIONS = {"txt", "docx", "pdf", "csv"}
 MAX_UPLOAD_SIZE_MB = 10
+# Files over 8MB go up as concurrently uploaded 8MB parts.
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
 
 
 def _allowed_upload(filename: str) -> bool:
@@ -527,22 +541,19 @@ def api_create_student():
 @role_required("educator")
 def educator_dashboard():
     educator_id = current_user.id
+    stats = get_educator_dashboard_stats(educator_id)
     summary = {
-        "total_students": count_students_for_educator(educator_id),
-        "pending_recommendations": count_pending_recommendations_for_educator(
-            educator_id
-        ),
+        "total_students": stats["total_students"],
+        "pending_recommendations": stats["pending_recommendations"],
     }
     students_raw = list_students_with_stats_for_educator(educator_id)
     students_by_grade_and_class: dict[int, dict[int, dict[str, object]]] = {6: {}, 7: {}, 8: {}}
     for entry in students_raw:
-        row = dict(entry)
-        grade = row.get("grade_level")
-        class_number = row.get("class_number")
+        grade = entry.grade_level
         if not isinstance(grade, int) or grade not in students_by_grade_and_class:
             continue
         try:
-            class_number_int = int(class_number)
+            class_number_int = int(entry.class_number)
         except (TypeError, ValueError):
             continue
         class_groups = students_by_grade_and_class[grade]
@@ -552,15 +563,15 @@ def educator_dashboard():
         )
         bucket["students"].append(
             {
-                "id": row.get("id"),
-                "name": row.get("name"),
-                "username": row.get("username", ""),
+                "id": entry.id,
+                "name": entry.name,
+                "username": entry.username or "",
                 "grade_level": grade,
                 "class_number": class_number_int,
-                "vocabulary_level": row.get("vocabulary_level"),
-                "pending_words": row.get("pending_words", 0),
-                "approved_words": row.get("approved_words", 0),
-                "last_upload_at": row.get("last_upload_at"),
+                "vocabulary_level": entry.vocabulary_level,
+                "pending_words": entry.pending_words,
+                "approved_words": entry.approved_words,
+                "last_upload_at": entry.last_upload_at,
             }
         )
     for grade_groups in students_by_grade_and_class.values():
@@ -587,28 +598,27 @@ def educator_dashboard():
 @role_required("educator")
 def api_educator_dashboard():
     educator_id = current_user.id
+    stats = get_educator_dashboard_stats(educator_id)
     summary = {
-        "total_students": count_students_for_educator(educator_id),
-        "pending_recommendations": count_pending_recommendations_for_educator(
-            educator_id
-        ),
+        "total_students": stats["total_students"],
+        "pending_recommendations": stats["pending_recommendations"],
     }
     students = list_students_with_stats_for_educator(educator_id)
 
-    def _serialize_student(entry: dict[str, object]) -> dict[str, object]:
-        last_upload = entry.get("last_upload_at")
+    def _serialize_student(entry: StudentStatsRow) -> dict[str, object]:
+        last_upload = entry.last_upload_at
         if isinstance(last_upload, (datetime.datetime, datetime.date)):
             iso_last_upload = last_upload.isoformat()
         else:
             iso_last_upload = str(last_upload) if last_upload else None
         return {
-            "id": entry.get("id"),
-            "name": entry.get("name"),
-            "grade_level": entry.get("grade_level"),
-            "class_number": entry.get("class_number"),
-            "vocabulary_level": entry.get("vocabulary_level"),
-            "pending_words": entry.get("pending_words", 0),
-            "approved_words": entry.get("approved_words", 0),
+            "id": entry.id,
+            "name": entry.name,
+            "grade_level": entry.grade_level,
+            "class_number": entry.class_number,
+            "vocabulary_level": entry.vocabulary_level,
+            "pending_words": entry.pending_words,
+            "approved_words": entry.approved_words,
             "last_upload_at": iso_last_upload,
         }
 
@@ -687,7 +697,7 @@ def api_list_recommendations():
 
     items_payload: list[dict[str, object]] = []
     for entry in data.get("items", []):
-        created_at = entry.get("created_at")
+        created_at = entry.created_at
         created_iso: Optional[str]
         if isinstance(created_at, datetime.datetime):
             created_iso = created_at.isoformat()
@@ -705,16 +715,16 @@ def api_list_recommendations():
 
         items_payload.append(
             {
-                "id": entry.get("id"),
-                "student_id": entry.get("student_id"),
-                "student_name": entry.get("student_name"),
-                "word": entry.get("word"),
-                "definition": entry.get("definition"),
-                "rationale": entry.get("rationale"),
-                "difficulty_score": entry.get("difficulty_score"),
-                "example_sentence": entry.get("example_sentence"),
-                "status": entry.get("status"),
-                "pinned": bool(entry.get("pinned")),
+                "id": entry.id,
+                "student_id": entry.student_id,
+                "student_name": entry.student_name,
+                "word": entry.word,
+                "definition": entry.definition,
+                "rationale": entry.rationale,
+                "difficulty_score": entry.difficulty_score,
+                "example_sentence": entry.example_sentence,
+                "status": entry.status,
+                "pinned": entry.pinned,
                 "created_at": created_iso,
             }
         )
@@ -872,7 +882,7 @@ def api_educator_export_class(grade_level: int, class_number: int):
     return response
 
 
-def _build_students_csv(students: Sequence[dict[str, object]]) -> str:
+def _build_students_csv(students: Sequence[StudentStatsRow]) -> str:
     """Return CSV string for a collection of student records."""
     output = io.StringIO()
     writer = csv.writer(output)
@@ -891,13 +901,13 @@ def _build_students_csv(students: Sequence[dict[str, object]]) -> str:
     for entry in students:
         writer.writerow(
             [
-                entry.get("id"),
-                _csv_safe(entry.get("name")),
-                entry.get("grade_level"),
-                entry.get("class_number"),
-                entry.get("vocabulary_level"),
-                entry.get("pending_words", 0),
-                _isoformat_or_none(entry.get("last_upload_at")),
+                entry.id,
+                _csv_safe(entry.name),
+                entry.grade_level,
+                entry.class_number,
+                entry.vocabulary_level,
+                entry.pending_words,
+                _isoformat_or_none(entry.last_upload_at),
             ]
         )
 
@@ -911,28 +921,43 @@ def _csv_safe(value: object) -> object:
     return value
 
 
-def _isoformat_or_none(value: object) -> Optional[str]:
-    if value in (None, "", "null"):
+def _isoformat_str(value: str) -> Optional[str]:
+    if value in ("", "null"):
         return None
+    try:
+        return datetime.datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        return value
+
+
+def _isoformat_date(value: datetime.date) -> str:
+    return datetime.datetime.combine(value, datetime.datetime.min.time()).isoformat()
+
+
+_ISOFORMAT_HANDLERS: dict[type, Callable[[object], Optional[str]]] = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: _isoformat_date,
+    str: _isoformat_str,
+}
+
+
+def _isoformat_or_none(value: object) -> Optional[str]:
+    handler = _ISOFORMAT_HANDLERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+    # Subclasses of the handled types fall back to isinstance checks.
     if isinstance(value, datetime.datetime):
         return value.isoformat()
     if isinstance(value, datetime.date):
-        return datetime.datetime.combine(value, datetime.datetime.min.time()).isoformat()
+        return _isoformat_date(value)
     if isinstance(value, str):
-        try:
-            return datetime.datetime.fromisoformat(value).isoformat()
-        except ValueError:
-            return value
+        return _isoformat_str(value)
     return None
 
 
 @bp.get("/api/student/dashboard")
 @role_required("student")
 def api_student_dashboard():
-    # CRITICAL: Reset database connection to ensure we're using PostgreSQL
-    from models import reset_engine
-    reset_engine()
-    
     student_id = current_user.id
     ensure_student_progress_row(student_id)
 
@@ -970,14 +995,12 @@ def api_student_dashboard():
             }
         )
 
-    approved_words_raw = list_approved_words_for_student(student_id, limit=500, offset=0)
-    mastery_raw = list_word_mastery_for_student(student_id)
-    mastery_lookup = {entry.get("word_id"): entry for entry in mastery_raw}
+    approved_words_raw = list_approved_words_with_mastery(student_id, limit=500, offset=0)
 
     approved_words_payload: list[dict[str, object]] = []
     for entry in approved_words_raw:
         word_id = entry.get("id")
-        mastery_entry = mastery_lookup.get(word_id, {})
+        has_mastery = entry.get("mastery_word_id") is not None
         approved_words_payload.append(
             {
                 "id": word_id,
@@ -989,28 +1012,30 @@ def api_student_dashboard():
                 "pinned": bool(entry.get("pinned")),
                 "created_at": _isoformat_or_none(entry.get("created_at")),
                 "mastery": {
-                    "mastery_stage": mastery_entry.get("mastery_stage", "practicing"),
-                    "correct_count": mastery_entry.get("correct_count", 0),
-                    "last_practiced_at": _isoformat_or_none(
-                        mastery_entry.get("last_practiced_at")
-                    ),
+                    "mastery_stage": entry.get("mastery_stage") if has_mastery else "practicing",
+                    "correct_count": entry.get("correct_count") if has_mastery else 0,
+                    "last_practiced_at": _isoformat_or_none(entry.get("last_practiced_at")),
                 },
             }
         )
 
+    # The top-level list covers every mastery row, not only the approved words
+    # returned above, so it is read separately.
+    mastery_payload = [
+        {
+            "word_id": entry.get("word_id"),
+            "mastery_stage": entry.get("mastery_stage"),
+            "correct_count": entry.get("correct_count"),
+            "last_practiced_at": _isoformat_or_none(entry.get("last_practiced_at")),
+        }
+        for entry in list_word_mastery_for_student(student_id)
+    ]
+
     response_payload = {
         "progress": progress_payload,
         "badges": badges_payload,
         "approved_words": approved_words_payload,
-        "mastery": [
-            {
-                "word_id": entry.get("word_id"),
-                "mastery_stage": entry.get("mastery_stage"),
-                "correct_count": entry.get("correct_count"),
-                "last_practiced_at": _isoformat_or_none(entry.get("last_practiced_at")),
-            }
-            for entry in mastery_raw
-        ],
+        "mastery": mastery_payload,
         "can_start_quiz": len(approved_words_payload) >= 5,
     }
     return jsonify(response_payload)
@@ -1025,11 +1050,6 @@ def student_dashboard():
 @bp.get("/educator/students/<username>")
 @role_required("educator")
 def educator_student_detail(username: str):
-    from models import get_student_overview_by_username
-    # CRITICAL: Reset database connection to ensure we're using PostgreSQL
-    from models import reset_engine
-    reset_engine()
-    
     overview = get_student_overview_by_username(current_user.id, username)
     if overview is None:
         abort(404)
@@ -1088,11 +1108,6 @@ def educator_upload_page():
 @bp.post("/api/upload")
 @role_required("educator")
 def api_upload():
-    # CRITICAL: Reset database connection to ensure we're using PostgreSQL
-    # This must be done at the start of every request to prevent cached SQLite connections
-    from models import reset_engine
-    reset_engine()
-    
     student_id_raw = request.form.get("student_id", "").strip()
     if not student_id_raw:
         return jsonify({"error": "student_id is required"}), 400
@@ -1151,18 +1166,13 @@ def api_upload():
 
         upload_id = None  # Initialize to track if upload record was created
         try:
-            s3_client.upload_fileobj(stream, settings.AWS_S3_BUCKET_NAME, s3_key)
+            s3_client.upload_fileobj(
+                stream,
+                settings.AWS_S3_BUCKET_NAME,
+                s3_key,
+                Config=S3_TRANSFER_CONFIG,
+            )
             file_path = f"s3://{settings.AWS_S3_BUCKET_NAME}/{s3_key}"
-            
-            # CRITICAL: Ensure we're using the correct database before creating upload
-            # Reset connection to pick up any environment changes
-            from models import reset_engine, get_connection
-            import logging
-
-            logger = logging.getLogger(__name__)
-            reset_engine()
-            conn = get_connection()
-            logger.info("Creating upload record using connection %s", type(conn))
 
             upload_id = create_upload_record(
                 educator_id=current_user.id,
@@ -1184,7 +1194,6 @@ def api_upload():
             try:
                 enqueue_upload_job(upload_id)
                 # Mark as processing immediately so UI shows correct state
-                from models import update_upload_status
                 update_upload_status(upload_id, "processing")
                 logger.info(
                     "Successfully enqueued upload job %s for file %s (student %s) - marked as processing",
@@ -1249,8 +1258,6 @@ def api_upload():
                 )
                 continue
         except Exception as exc:  # pragma: no cover - network or boto errors
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(
                 "Error processing upload %s: %s",
                 original_name,
@@ -1284,7 +1291,6 @@ def api_upload():
     
     # Add redirect URL and success message for successful uploads
     # Get student username for the redirect URL
-    from models import get_student_profile
     student_profile = get_student_profile(student_id)
     student_username = student_profile.get("username") if student_profile else None
     if student_username:
@@ -1305,10 +1311,6 @@ def api_upload():
 @bp.get("/api/job-status/<int:upload_id>")
 @role_required("educator")
 def api_job_status(upload_id: int):
-    # CRITICAL: Reset database connection to ensure we're using PostgreSQL
-    from models import reset_engine
-    reset_engine()
-    
     status = get_upload_status(upload_id)
     if status is None:
         return jsonify({"error": "Upload not found."}), 404
@@ -1319,10 +1321,6 @@ def api_job_status(upload_id: int):
 @role_required("educator")
 def api_delete_upload(student_id: int, upload_id: int):
     """Delete an upload for a student. Verifies the student belongs to the educator."""
-    # CRITICAL: Reset database connection to ensure we're using PostgreSQL
-    from models import reset_engine
-    reset_engine()
-    
     # Verify student belongs to educator
     overview = get_student_overview(current_user.id, student_id)
     if overview is None:
@@ -1363,12 +1361,9 @@ def api_delete_student(student_id: int):
     # - word_mastery
     # - quiz_attempts
     try:
-        from models import delete_user
         delete_user(student_id)
         return jsonify({"success": True, "message": "Student and all associated data deleted successfully."}), 200
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Failed to delete student {student_id}: {e}", exc_info=True)
         return jsonify({"error": f"Failed to delete student: {str(e)}"}), 500
 
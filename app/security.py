@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import bcrypt
 
+from config.settings import get_settings
+
 
 def hash_password(plaintext: str) -> str:
     """Return a bcrypt hash for the provided password."""
@@ -11,7 +13,8 @@ def hash_password(plaintext: str) -> str:
         raise ValueError("Password must be provided.")
 
     password_bytes = plaintext.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    salt = bcrypt.gensalt(rounds=get_settings().BCRYPT_ROUNDS)
+    hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from typing import List
 
+import httpx
 from openai import OpenAI
 
 from config.settings import get_settings
 
 _CLIENT: OpenAI | None = None
 
+HTTP_TIMEOUT_SECONDS = 60.0
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
 
 class OpenAIConfigurationError(RuntimeError):
     """Raised when OpenAI client cannot be configured."""
@@ -26,7 +30,13 @@ def _get_client() -> OpenAI:
     if not settings.OPENAI_API_KEY:
         raise OpenAIConfigurationError("OPENAI_API_KEY is not configured.")
 
-    _CLIENT = OpenAI(api_key=settings.OPENAI_API_KEY)
+    # One pooled HTTP/2 client per process so calls reuse the TLS connection.
+    http_client = httpx.Client(
+        http2=True,
+        timeout=HTTP_TIMEOUT_SECONDS,
+        limits=HTTP_LIMITS,
+    )
+    _CLIENT = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
     return _CLIENT
 
 
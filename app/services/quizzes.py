@@ -6,12 +6,10 @@ from typing import Sequence
 
 from models import (
     award_badges_if_needed,
-    count_mastered_words,
     get_student_recommendations_by_ids,
     list_quiz_candidates,
-    record_quiz_attempts,
-    update_student_progress_for_quiz,
-    update_word_mastery_from_results,
+    persist_quiz_result,
+    shared_connection,
 )
 
 MAX_QUIZ_QUESTIONS = 10
@@ -31,7 +29,12 @@ def build_quiz_questions(
 ) -> list[dict[str, object]]:
     """Return quiz questions for the student."""
     candidates = list_quiz_candidates(student_id, limit=200)
-    filtered = [entry for entry in candidates if _normalize_definition(entry.get("definition"))]
+    filtered: list[dict[str, object]] = []
+    for entry in candidates:
+        definition = _normalize_definition(entry.get("definition"))
+        if definition:
+            entry["_definition"] = definition
+            filtered.append(entry)
 
     if len(filtered) < MIN_APPROVED_WORDS:
         raise ValueError("Not enough approved words to generate a quiz.")
@@ -42,12 +45,14 @@ def build_quiz_questions(
         recent_target = target
 
     recent_choices = filtered[:recent_target]
-    remaining_pool = [entry for entry in filtered if entry not in recent_choices]
+    # Candidates are distinct rows, so everything after the recent slice is the remainder.
+    remaining_pool = filtered[len(recent_choices):]
     older_needed = target - len(recent_choices)
 
     if older_needed > 0:
         if len(remaining_pool) >= older_needed:
-            older_choices = random.sample(remaining_pool, older_needed)
+            picked = random.sample(range(len(remaining_pool)), older_needed)
+            older_choices = [remaining_pool[index] for index in picked]
         else:
             older_choices = remaining_pool
     else:
@@ -64,15 +69,17 @@ def build_quiz_questions(
 
     random.shuffle(selected)
 
-    all_definitions = [_normalize_definition(entry.get("definition")) for entry in filtered]
+    # Unique, insertion-ordered, so a definition shared by two words is never offered twice.
+    all_definitions = tuple(dict.fromkeys(entry["_definition"] for entry in filtered))
 
     questions: list[dict[str, object]] = []
     for entry in selected:
-        correct_definition = _normalize_definition(entry.get("definition"))
-        other_definitions = [definition for definition in all_definitions if definition and definition != correct_definition]
+        correct_definition = entry["_definition"]
+        other_definitions = [definition for definition in all_definitions if definition != correct_definition]
 
         if len(other_definitions) >= DISTRACTOR_COUNT:
-            distractors = random.sample(other_definitions, DISTRACTOR_COUNT)
+            picked = random.sample(range(len(other_definitions)), DISTRACTOR_COUNT)
+            distractors = [other_definitions[index] for index in picked]
         else:
             distractors = other_definitions[:]
 
@@ -146,27 +153,18 @@ def score_quiz_and_update(
     if evaluated == 0:
         raise ValueError("Unable to evaluate quiz answers.")
 
-    record_quiz_attempts(
-        student_id=student_id,
-        attempts=attempts_payload,
-        attempted_at=timestamp,
-    )
-
-    mastery_summary = update_word_mastery_from_results(
-        student_id=student_id,
-        results=mastery_payload,
-        attempted_at=timestamp,
-    )
-
-    progress = update_student_progress_for_quiz(
-        student_id=student_id,
-        correct=correct_count,
-        total=evaluated,
-        attempted_at=timestamp,
-    )
-
-    mastered_total = count_mastered_words(student_id)
-    new_badges = award_badges_if_needed(student_id, mastered_total)
+    with shared_connection():
+        persisted = persist_quiz_result(
+            student_id=student_id,
+            attempts=attempts_payload,
+            mastery=mastery_payload,
+            correct=correct_count,
+            total=evaluated,
+            attempted_at=timestamp,
+        )
+        new_badges = award_badges_if_needed(student_id, persisted["mastered_total"])
+    mastery_summary = persisted["mastery"]
+    progress = persisted["progress"]
 
     last_quiz_at = progress.get("last_quiz_at")
     if isinstance(last_quiz_at, datetime.datetime):
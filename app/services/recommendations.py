@@ -1,90 +1,235 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Iterable
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Sequence
 
 from config.settings import get_settings
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
 from . import openai_client
 
 RESPONSE_JSON_KEY = "recommendations"
 MAX_SAMPLE_CHARS = 6000
 BASELINE_SUMMARY_LIMIT = 25
 
+RESPONSE_CACHE_MAX_ENTRIES = 100
+
+_RESPONSE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+_K_WORD = "word"
+_K_DEFINITION = "definition"
+_K_RATIONALE = "rationale"
+_K_DIFFICULTY = "difficulty_score"
+_K_EXAMPLE = "example_sentence"
+
+_SYSTEM_PROMPT = (
+    "You are an expert literacy coach who creates age-appropriate vocabulary suggestions "
+    "for middle school students. Avoid profanity and overly mature language. "
+    "Return JSON with a key 'recommendations' containing a list of objects. "
+    "Each object must include the fields: "
+    "'word' (string), 'definition' (string), 'rationale' (string explaining why "
+    "the student should learn the word), 'difficulty_score' (integer 1-10), "
+    "and 'example_sentence' (string, age-appropriate, using the word correctly). "
+    "Do not include any additional keys or commentary."
+)
+_USER_HEADER_TEMPLATE = (
+    "Student grade level: {grade}\n"
+    "Current vocabulary level estimate: {vocab}\n"
+    "Target recommendations: {count} words"
+)
+_BATCH_SYSTEM_PROMPT_TEMPLATE = (
+    "You are an expert literacy coach who creates age-appropriate vocabulary suggestions "
+    "for middle school students. Avoid profanity and overly mature language. "
+    "You will receive {count} independent students, each under a '### STUDENT n' header. "
+    "Return one JSON object with the keys 'recommendations_1' through 'recommendations_{count}', "
+    "where 'recommendations_n' is the list of recommendations for STUDENT n only. "
+    "Each recommendation object must include the fields: "
+    "'word' (string), 'definition' (string), 'rationale' (string explaining why "
+    "the student should learn the word), 'difficulty_score' (integer 1-10), "
+    "and 'example_sentence' (string, age-appropriate, using the word correctly). "
+    "Do not include any additional keys or commentary."
+)
+_BATCH_STUDENT_HEADER = "### STUDENT {index}"
+_BASELINE_PREFIX = "Baseline vocabulary already familiar to the student (avoid duplicates): "
+_SAMPLE_HEADER = "Student writing sample (cleaned):"
+
 
 class RecommendationParseError(RuntimeError):
     """Raised when the OpenAI response cannot be parsed into recommendation objects."""
 
 
+def _response_cache_key(messages: list[dict[str, str]], model: str, temperature: float) -> str:
+    encoded = json.dumps([messages, model, temperature], sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _cached_response(key: str) -> Optional[str]:
+    with _RESPONSE_CACHE_LOCK:
+        response_str = _RESPONSE_CACHE.get(key)
+        if response_str is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+        return response_str
+
+
+def _store_response(key: str, response_str: str) -> None:
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = response_str
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX_ENTRIES:
+            _RESPONSE_CACHE.popitem(last=False)
+
+
+def _request_json(
+    messages: list[dict[str, str]],
+    *,
+    use_cache: bool,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.4,
+) -> tuple[str, Optional[str]]:
+    """Return the raw JSON response and its cache key (None when caching is off)."""
+    key = _response_cache_key(messages, model, temperature) if use_cache else None
+    if key is not None:
+        response_str = _cached_response(key)
+        if response_str is not None:
+            return response_str, key
+    response_str = openai_client.generate_json_response(
+        messages,
+        model=model,
+        temperature=temperature,
+    )
+    return response_str, key
+
+
+def _clean_str(value: object) -> str:
+    """Strip a field value, skipping str() for the common already-a-string case."""
+    if type(value) is str:
+        return value.strip()
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
 def _truncate(text: str, limit: int) -> str:
     if len(text) <= limit:
         return text
-    return text[:limit] + "..."
+    # Cut at the last whitespace inside the budget so the prompt never ends in a
+    # partial word, which would tokenize into extra meaningless tokens.
+    cut = text.rfind(" ", 0, limit + 1)
+    if cut <= limit // 2:
+        cut = limit
+    return text[:cut].rstrip() + "..."
 
 
 def _baseline_summary(baseline_words: Iterable[dict[str, object]]) -> str:
     unique_words: list[str] = []
+    append_word = unique_words.append
+    seen_words: set[str] = set()
+    add_seen = seen_words.add
+    limit = BASELINE_SUMMARY_LIMIT
     for entry in baseline_words:
-        word = str(entry.get("word", "")).strip()
+        word = _clean_str(entry.get(_K_WORD))
         if not word:
             continue
-        if word.lower() not in {w.lower() for w in unique_words}:
-            unique_words.append(word)
-        if len(unique_words) >= BASELINE_SUMMARY_LIMIT:
+        word_lower = word.lower()
+        if word_lower in seen_words:
+            continue
+        add_seen(word_lower)
+        append_word(word)
+        if len(unique_words) >= limit:
             break
     return ", ".join(unique_words)
 
 
-def build_messages(
+def _student_prompt_lines(
     *,
     student_profile: dict[str, object],
     writing_sample: str,
     baseline_words: Iterable[dict[str, object]],
-    target_batch_size: int = 5,
-) -> list[dict[str, str]]:
-    """Build chat messages for the OpenAI call."""
+    target_batch_size: int,
+) -> list[str]:
     grade_level = student_profile.get("grade_level", "unknown")
     vocabulary_level = student_profile.get("vocabulary_level", "unknown")
     baseline_list = _baseline_summary(baseline_words)
 
-    system_prompt = (
-        "You are an expert literacy coach who creates age-appropriate vocabulary suggestions "
-        "for middle school students. Avoid profanity and overly mature language. "
-        "Return JSON with a key 'recommendations' containing a list of objects. "
-        "Each object must include the fields: "
-        "'word' (string), 'definition' (string), 'rationale' (string explaining why "
-        "the student should learn the word), 'difficulty_score' (integer 1-10), "
-        "and 'example_sentence' (string, age-appropriate, using the word correctly). "
-        "Do not include any additional keys or commentary."
-    )
-
     writing_excerpt = _truncate(writing_sample, MAX_SAMPLE_CHARS)
 
     user_prompt_lines = [
-        f"Student grade level: {grade_level}",
-        f"Current vocabulary level estimate: {vocabulary_level}",
-        f"Target recommendations: {max(5, target_batch_size)} words",
+        _USER_HEADER_TEMPLATE.format_map(
+            {
+                "grade": grade_level,
+                "vocab": vocabulary_level,
+                "count": max(5, target_batch_size),
+            }
+        )
     ]
     if baseline_list:
-        user_prompt_lines.append(
-            "Baseline vocabulary already familiar to the student (avoid duplicates): "
-            + baseline_list
-        )
-    user_prompt_lines.append("Student writing sample (cleaned):")
+        user_prompt_lines.append(_BASELINE_PREFIX + baseline_list)
+    user_prompt_lines.append(_SAMPLE_HEADER)
     user_prompt_lines.append(writing_excerpt)
+    return user_prompt_lines
 
+
+def build_messages(
+    *,
+    student_profile: dict[str, object],
+    writing_sample: str,
+    baseline_words: Iterable[dict[str, object]],
+    target_batch_size: int = 5,
+) -> list[dict[str, str]]:
+    """Build chat messages for the OpenAI call."""
+    user_prompt_lines = _student_prompt_lines(
+        student_profile=student_profile,
+        writing_sample=writing_sample,
+        baseline_words=baseline_words,
+        target_batch_size=target_batch_size,
+    )
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": _SYSTEM_PROMPT},
         {"role": "user", "content": "\n".join(user_prompt_lines)},
     ]
     return messages
 
 
+def build_batch_messages(requests: Sequence[dict[str, object]]) -> list[dict[str, str]]:
+    """Build one set of chat messages covering several students."""
+    return _batch_messages([_request_prompt_lines(request) for request in requests])
+
+
+def _request_prompt_lines(request: dict[str, object]) -> list[str]:
+    return _student_prompt_lines(
+        student_profile=request["student_profile"],
+        writing_sample=request["writing_sample"],
+        baseline_words=request["baseline_words"],
+        target_batch_size=request.get("target_batch_size", 5),
+    )
+
+
+def _batch_messages(student_sections: Sequence[list[str]]) -> list[dict[str, str]]:
+    lines: list[str] = []
+    for index, section in enumerate(student_sections, start=1):
+        lines.append(_BATCH_STUDENT_HEADER.format(index=index))
+        lines.extend(section)
+    return [
+        {"role": "system", "content": _BATCH_SYSTEM_PROMPT_TEMPLATE.format(count=len(student_sections))},
+        {"role": "user", "content": "\n".join(lines)},
+    ]
+
+
 def parse_recommendations_from_json(payload_str: str) -> list[dict[str, object]]:
     """Parse OpenAI JSON response into a list of recommendation objects."""
     try:
-        payload = json.loads(payload_str)
-    except json.JSONDecodeError as exc:
+        payload = _loads(payload_str)
+    except json.JSONDecodeError as exc:  # orjson's decode error subclasses this
         raise RecommendationParseError("Failed to parse JSON from OpenAI response.") from exc
 
     if isinstance(payload, list):
@@ -97,33 +242,64 @@ def parse_recommendations_from_json(payload_str: str) -> list[dict[str, object]]
     if not isinstance(items, list):
         raise RecommendationParseError("OpenAI did not return a list of recommendations.")
 
+    return _normalize_items(items)
+
+
+def _normalize_items(items: list[object]) -> list[dict[str, object]]:
     normalized: list[dict[str, object]] = []
+    append_item = normalized.append
     seen_words: set[str] = set()
+    add_seen = seen_words.add
 
     for entry in items:
         if not isinstance(entry, dict):
             continue
-        word = str(entry.get("word", "")).strip()
+        get = entry.get
+        word = _clean_str(get(_K_WORD))
         if not word:
             continue
         word_lower = word.lower()
         if word_lower in seen_words:
             continue
-        seen_words.add(word_lower)
+        add_seen(word_lower)
 
-        normalized.append(
+        append_item(
             {
-                "word": word,
-                "definition": str(entry.get("definition", "")).strip(),
-                "rationale": str(entry.get("rationale", "")).strip(),
-                "difficulty_score": entry.get("difficulty_score", 1),
-                "example_sentence": str(entry.get("example_sentence", "")).strip(),
+                _K_WORD: word,
+                _K_DEFINITION: _clean_str(get(_K_DEFINITION)),
+                _K_RATIONALE: _clean_str(get(_K_RATIONALE)),
+                _K_DIFFICULTY: get(_K_DIFFICULTY, 1),
+                _K_EXAMPLE: _clean_str(get(_K_EXAMPLE)),
             }
         )
 
     return normalized
 
 
+def parse_batch_recommendations_from_json(
+    payload_str: str,
+    count: int,
+) -> list[list[dict[str, object]]]:
+    """Parse a batched OpenAI JSON response into one recommendation list per student."""
+    try:
+        payload = _loads(payload_str)
+    except json.JSONDecodeError as exc:
+        raise RecommendationParseError("Failed to parse JSON from OpenAI response.") from exc
+
+    if not isinstance(payload, dict):
+        raise RecommendationParseError("Unexpected response format from OpenAI.")
+
+    results: list[list[dict[str, object]]] = []
+    for index in range(1, count + 1):
+        items = payload.get(f"{RESPONSE_JSON_KEY}_{index}")
+        if not isinstance(items, list):
+            raise RecommendationParseError(
+                f"OpenAI did not return a list of recommendations for student {index}."
+            )
+        results.append(_normalize_items(items))
+    return results
+
+
 def generate_recommendations(
     *,
     student_profile: dict[str, object],
@@ -132,18 +308,21 @@ def generate_recommendations(
     target_batch_size: int = 5,
 ) -> list[dict[str, object]]:
     """Return AI-generated vocabulary recommendations for the provided writing sample."""
-    settings = get_settings()
     messages = build_messages(
         student_profile=student_profile,
         writing_sample=writing_sample,
         baseline_words=baseline_words,
         target_batch_size=target_batch_size,
     )
-    response_str = openai_client.generate_json_response(
-        messages,
-        model="gpt-4o-mini",
-        temperature=0.4,
-    )
+    return _generate_from_messages(messages, target_batch_size)
+
+
+def _generate_from_messages(
+    messages: list[dict[str, str]],
+    target_batch_size: int,
+) -> list[dict[str, object]]:
+    settings = get_settings()
+    response_str, cache_key = _request_json(messages, use_cache=settings.RECS_CACHE_ENABLED)
     recommendations = parse_recommendations_from_json(response_str)
 
     if len(recommendations) < max(5, target_batch_size):
@@ -151,5 +330,38 @@ def generate_recommendations(
             "OpenAI returned fewer recommendations than required."
         )
 
+    # Only responses that parsed and validated are cached, so retries after a
+    # bad response still go back to the model.
+    if cache_key is not None:
+        _store_response(cache_key, response_str)
     return recommendations
 
+
+def generate_recommendations_batch(
+    requests: Sequence[dict[str, object]],
+) -> list[list[dict[str, object]]]:
+    """Return recommendations for several students using a single OpenAI call.
+
+    Each request holds the keyword arguments of ``generate_recommendations``.
+    """
+    if not requests:
+        return []
+    if len(requests) == 1:
+        return [generate_recommendations(**requests[0])]
+
+    messages = build_batch_messages(requests)
+    response_str, cache_key = _request_json(
+        messages,
+        use_cache=get_settings().RECS_CACHE_ENABLED,
+    )
+    results = parse_batch_recommendations_from_json(response_str, len(requests))
+
+    for index, (request, result) in enumerate(zip(requests, results), start=1):
+        if len(result) < max(5, request.get("target_batch_size", 5)):
+            raise RecommendationParseError(
+                f"OpenAI returned fewer recommendations than required for student {index}."
+            )
+
+    if cache_key is not None:
+        _store_response(cache_key, response_str)
+    return results
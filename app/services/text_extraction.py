@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import csv
 import io
-import re
-from typing import Callable
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import MappingProxyType
+from typing import Callable, Iterator, Mapping, Optional
 
-import pandas as pd
 import pdfplumber
 from docx import Document
 
+from config.settings import get_settings
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # pragma: no cover - optional faster PDF backend
+    fitz = None
+
 SUPPORTED_EXTENSIONS = {"txt", "docx", "pdf", "csv"}
-_WHITESPACE_RE = re.compile(r"\s+")
 
 
 class UnsupportedFileTypeError(ValueError):
@@ -23,52 +34,212 @@ def _extract_txt(data: bytes) -> str:
 def _extract_docx(data: bytes) -> str:
     stream = io.BytesIO(data)
     document = Document(stream)
-    paragraphs = [p.text.strip() for p in document.paragraphs if p.text and p.text.strip()]
+    paragraphs: list[str] = []
+    for paragraph in document.paragraphs:
+        text = paragraph.text
+        if not text:
+            continue
+        text = text.strip()
+        if text:
+            paragraphs.append(text)
     return "\n".join(paragraphs)
 
 
-def _extract_pdf(data: bytes) -> str:
-    stream = io.BytesIO(data)
-    texts: list[str] = []
-    with pdfplumber.open(stream) as pdf:
-        for page in pdf.pages:
+def _pymupdf_page_count(data: bytes) -> int:
+    document = fitz.open(stream=data, filetype="pdf")
+    try:
+        return document.page_count
+    finally:
+        document.close()
+
+
+def _iter_pymupdf_pages(data: bytes, start: int, stop: Optional[int]) -> Iterator[str]:
+    document = fitz.open(stream=data, filetype="pdf")
+    try:
+        stop = document.page_count if stop is None else min(stop, document.page_count)
+        for index in range(start, stop):
+            page_text = (document.load_page(index).get_text("text") or "").strip()
+            if page_text:
+                yield page_text
+    finally:
+        document.close()
+
+
+def _pdfplumber_page_count(data: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def _iter_pdfplumber_pages(data: bytes, start: int, stop: Optional[int]) -> Iterator[str]:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages[start:stop]:
             page_text = page.extract_text() or ""
+            # Drop the page's cached layout objects before moving on.
+            page.close()
             if page_text:
-                texts.append(page_text.strip())
-    return "\n".join(texts)
+                yield page_text.strip()
+
+
+# backend -> (page counter, page iterator over [start, stop))
+_PDF_BACKENDS: dict[str, tuple[Callable[[bytes], int], Callable[[bytes, int, Optional[int]], Iterator[str]]]] = {
+    "pymupdf": (_pymupdf_page_count, _iter_pymupdf_pages),
+    "pdfplumber": (_pdfplumber_page_count, _iter_pdfplumber_pages),
+}
+
+# (max pages, strategy): the first rule whose limit covers the page count wins.
+# Short documents are not worth handing to other processes. Very long ones are
+# streamed page by page in a single process, so memory is bounded by one page
+# instead of one document copy per worker; with PDF_USE_PROCESS_POOL that
+# process is a pool worker, which keeps the CPU work and any parser leaks out
+# of the caller.
+_PDF_DISPATCH_RULES: tuple[tuple[Optional[int], str], ...] = (
+    (10, "sequential"),
+    (200, "parallel"),
+    (None, "isolated"),
+)
+
+_PDF_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _pdf_backend() -> str:
+    """Return the configured PDF backend, falling back to pdfplumber."""
+    backend = get_settings().PDF_BACKEND
+    if backend == "pymupdf" and fitz is None:
+        return "pdfplumber"
+    if backend not in _PDF_BACKENDS:
+        return "pdfplumber"
+    return backend
+
+
+def _extract_pdf_page_range(backend: str, data: bytes, start: int, stop: Optional[int]) -> list[str]:
+    """Extract stripped, non-empty page texts for pages [start, stop)."""
+    return list(_PDF_BACKENDS[backend][1](data, start, stop))
+
+
+def _pdf_strategy(page_count: int) -> str:
+    for limit, strategy in _PDF_DISPATCH_RULES:
+        if limit is None or page_count <= limit:
+            return strategy
+    return "sequential"
+
+
+def _pdf_mp_context():
+    # forkserver avoids forking a process that may hold DB sockets and threads.
+    try:
+        return multiprocessing.get_context("forkserver")
+    except ValueError:  # pragma: no cover - platforms without forkserver
+        return multiprocessing.get_context("spawn")
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the shared PDF worker pool, creating it on first use."""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=_PDF_POOL_MAX_WORKERS,
+                mp_context=_pdf_mp_context(),
+            )
+        return _PDF_POOL
+
+
+def _discard_pdf_pool() -> None:
+    # A worker died (e.g. the parser crashed); start a fresh pool next time.
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        pool, _PDF_POOL = _PDF_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pdf_parallel(backend: str, data: bytes, page_count: int) -> list[str]:
+    # Neither backend can extract pages concurrently inside one interpreter
+    # (PyMuPDF is not thread-safe, pdfplumber is pure Python), so page ranges
+    # are spread across worker processes.
+    workers = min(_PDF_POOL_MAX_WORKERS, page_count)
+    if workers <= 1:
+        return _extract_pdf_page_range(backend, data, 0, None)
+    step = -(-page_count // workers)
+    starts = list(range(0, page_count, step))
+    stops = [start + step for start in starts]
+    try:
+        chunks = _get_pdf_pool().map(
+            _extract_pdf_page_range,
+            [backend] * len(starts),
+            [data] * len(starts),
+            starts,
+            stops,
+        )
+        return [text for chunk in chunks for text in chunk]
+    except BrokenProcessPool:
+        _discard_pdf_pool()
+        raise
+
+
+def _extract_pdf_isolated(backend: str, data: bytes) -> list[str]:
+    try:
+        return _get_pdf_pool().submit(_extract_pdf_page_range, backend, data, 0, None).result()
+    except BrokenProcessPool:
+        _discard_pdf_pool()
+        raise
+
+
+def _extract_pdf(data: bytes) -> str:
+    backend = _pdf_backend()
+    page_counter, iter_pages = _PDF_BACKENDS[backend]
+    settings = get_settings()
+    # Opening the document just to count pages only pays off when a strategy
+    # other than the in-process one is enabled.
+    if settings.PDF_PARALLEL or settings.PDF_USE_PROCESS_POOL:
+        page_count = page_counter(data)
+        strategy = _pdf_strategy(page_count)
+        if strategy == "parallel" and settings.PDF_PARALLEL:
+            return "\n".join(_extract_pdf_parallel(backend, data, page_count))
+        if strategy == "isolated" and settings.PDF_USE_PROCESS_POOL:
+            return "\n".join(_extract_pdf_isolated(backend, data))
+    return "\n".join(iter_pages(data, 0, None))
 
 
 def _extract_csv(data: bytes) -> str:
-    stream = io.BytesIO(data)
-    df = pd.read_csv(stream, dtype=str, keep_default_na=False)
+    text_stream = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", errors="ignore", newline="")
+    reader = csv.reader(text_stream)
+    # The header row names columns rather than carrying student writing.
+    next(reader, None)
     cells: list[str] = []
-    for value in df.to_numpy().flatten():
-        if value is None:
-            continue
-        text_value = str(value).strip()
-        if text_value:
-            cells.append(text_value)
+    for row in reader:
+        for value in row:
+            text_value = value.strip()
+            if text_value:
+                cells.append(text_value)
     return "\n".join(cells)
 
 
-_EXTRACTORS: dict[str, Callable[[bytes], str]] = {
-    "txt": _extract_txt,
-    "docx": _extract_docx,
-    "pdf": _extract_pdf,
-    "csv": _extract_csv,
-}
+_EXTRACTORS: Mapping[str, Callable[[bytes], str]] = MappingProxyType(
+    {
+        "txt": _extract_txt,
+        "docx": _extract_docx,
+        "pdf": _extract_pdf,
+        "csv": _extract_csv,
+    }
+)
 
 
 def normalize_text(text: str) -> str:
     """Normalize whitespace for consistent downstream handling."""
-    return _WHITESPACE_RE.sub(" ", text).strip()
+    # str.split() with no argument splits on the same Unicode whitespace as \s+.
+    return " ".join(text.split())
 
 
 def extract_text(file_bytes: bytes, filename: str) -> str:
     """Extract normalized text for supported file extensions."""
-    if not filename or "." not in filename:
+    # Unlike os.path.splitext, this treats ".txt" as a "txt" file, matching the
+    # upload route's extension check.
+    _, dot, ext = (filename or "").rpartition(".")
+    if not dot:
         raise UnsupportedFileTypeError("Filename must contain an extension.")
-    ext = filename.rsplit(".", 1)[1].lower()
+    ext = ext.lower()
     extractor = _EXTRACTORS.get(ext)
     if extractor is None:
         raise UnsupportedFileTypeError(f"Unsupported file extension: {ext}")
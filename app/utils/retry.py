@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import random
 import time
-from typing import Callable, Iterable, TypeVar
+from typing import Callable, Iterable, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -15,6 +15,7 @@ def execute_with_retry(
     cap_seconds: float = 30.0,
     jitter: bool = True,
     non_retry_exceptions: Iterable[type[BaseException]] = (),
+    total_deadline: Optional[float] = None,
 ) -> T:
     """
     Execute callable with retry logic and exponential backoff.
@@ -26,9 +27,13 @@ def execute_with_retry(
         cap_seconds: Maximum delay between attempts.
         jitter: Whether to apply random jitter (80%-120%) to delay.
         non_retry_exceptions: Iterable of exception classes that should not be retried.
+        total_deadline: Optional overall budget in seconds; the last error is raised
+            instead of sleeping past it.
     """
     attempts = 0
     non_retry_tuple = tuple(non_retry_exceptions)
+    delays = [min(base_delay**attempt, cap_seconds) for attempt in range(1, max_attempts)]
+    deadline = time.monotonic() + total_deadline if total_deadline is not None else None
 
     while True:
         try:
@@ -40,9 +45,9 @@ def execute_with_retry(
             if attempts >= max_attempts:
                 raise
 
-            delay = base_delay**attempts
-            delay = min(delay, cap_seconds)
+            delay = delays[attempts - 1]
             if jitter:
-                delay *= random.uniform(0.8, 1.2)
+                delay *= 0.8 + 0.4 * random.random()
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise
             time.sleep(delay)
-
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 # Track if .env has been loaded to avoid reloading multiple times
@@ -31,11 +32,14 @@ def _ensure_env_loaded() -> None:
         pass
 
 
+_FALSE_VALUES = frozenset({"0", "false", "off", "no"})
+
+
 def _env_bool(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None:
         return default
-    return raw.strip().lower() not in {"0", "false", "off", "no"}
+    return raw.strip().lower() not in _FALSE_VALUES
 
 
 @dataclass(frozen=True)
@@ -57,10 +61,23 @@ class Settings:
     PRIVACY_DEFAULT_ANONYMIZED: bool
     MIN_INITIAL_ANALYSIS_WORDS: int
     MIN_UPDATE_ANALYSIS_WORDS: int
+    BCRYPT_ROUNDS: int
+    PDF_BACKEND: str
+    PDF_PARALLEL: bool
+    PDF_USE_PROCESS_POOL: bool
+    RECS_CACHE_ENABLED: bool
+    DB_POOL_MIN_SIZE: int
+    DB_POOL_MAX_SIZE: int
+    DATABASE_URL_RO: str | None
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings, automatically loading .env file if needed."""
+    """Get application settings, automatically loading .env file if needed.
+
+    The result is memoized; call ``get_settings.cache_clear()`` after changing
+    environment variables so the next call re-reads them.
+    """
     _ensure_env_loaded()
     return Settings(
         SECRET_KEY=os.getenv("SECRET_KEY", "dev-insecure-key"),
@@ -80,5 +97,14 @@ def get_settings() -> Settings:
         PRIVACY_DEFAULT_ANONYMIZED=_env_bool("PRIVACY_DEFAULT_ANONYMIZED", False),
         MIN_INITIAL_ANALYSIS_WORDS=int(os.getenv("MIN_INITIAL_ANALYSIS_WORDS", "200")),
         MIN_UPDATE_ANALYSIS_WORDS=int(os.getenv("MIN_UPDATE_ANALYSIS_WORDS", "100")),
+        # bcrypt accepts 4-31; 12 (~250ms per hash) is the library default.
+        BCRYPT_ROUNDS=min(max(int(os.getenv("BCRYPT_ROUNDS", "12")), 4), 31),
+        PDF_BACKEND=os.getenv("PDF_BACKEND", "pymupdf").strip().lower(),
+        PDF_PARALLEL=_env_bool("PDF_PARALLEL", False),
+        PDF_USE_PROCESS_POOL=_env_bool("PDF_USE_PROCESS_POOL", False),
+        RECS_CACHE_ENABLED=_env_bool("RECS_CACHE_ENABLED", False),
+        DB_POOL_MIN_SIZE=max(int(os.getenv("DB_POOL_MIN_SIZE", "2")), 0),
+        DB_POOL_MAX_SIZE=max(int(os.getenv("DB_POOL_MAX_SIZE", "10")), 1),
+        DATABASE_URL_RO=os.getenv("DATABASE_URL_RO") or None,
     )
 
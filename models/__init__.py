@@ -6,18 +6,140 @@ import datetime
 import json
 import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Optional, Sequence
+from typing import Callable, Dict, Iterator, Optional, Sequence, TypeVar
 
 import psycopg
 from flask_login import UserMixin
 from psycopg import errors as pg_errors
-from psycopg.rows import dict_row
+from psycopg.pq import TransactionStatus
+from psycopg.rows import dict_row, tuple_row
+from psycopg_pool import ConnectionPool
 
 from config.settings import get_settings
 
 _connection: Optional[object] = None
+_connection_pid: Optional[int] = None  # process that opened _connection
 _backend: Optional[str] = None  # "sqlite" or "postgres"
+_pool: Optional[ConnectionPool] = None
+_pool_pid: Optional[int] = None  # process that opened _pool
+_read_pool: Optional[ConnectionPool] = None  # replica pool, only with DATABASE_URL_RO
+_read_pool_pid: Optional[int] = None
+# Guards creating and tearing down _connection and _pool. Re-entrant because
+# get_connection() calls reset_engine() while holding it.
+_conn_lock = threading.RLock()
+
+# Prepare every parameterised statement on first use instead of psycopg's
+# default of five; the prepared-statement cache is per connection, and the
+# DAL runs the same small set of statements over and over.
+_PREPARE_THRESHOLD = 0
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[object, tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Flask-Login loads the current user on every request. Entries are per process,
+# so the TTL bounds how long another worker can keep serving a deleted user.
+_user_cache = _TTLCache(maxsize=4096, ttl=30.0)
+# Baseline words are seeded once and never edited; badges are only written by
+# award_badges_if_needed(), which evicts the student's entry.
+_baseline_words_cache = _TTLCache(maxsize=64, ttl=3600.0)
+_badge_cache = _TTLCache(maxsize=4096, ttl=60.0)
+
+# Per-request memo of read results, keyed by (function name, args, kwargs). Only
+# active between begin_request_cache() and end_request_cache(); outside a
+# request (worker, scripts) reads always hit the database.
+_request_cache: ContextVar[Optional[dict]] = ContextVar("wordbridge_request_cache", default=None)
+
+_F = TypeVar("_F", bound=Callable)
+
+
+def begin_request_cache() -> None:
+    """Start an empty read cache for the current request."""
+    _request_cache.set({})
+
+
+def end_request_cache() -> None:
+    """Drop the current request's read cache."""
+    _request_cache.set(None)
+
+
+def _request_cached(fn: _F) -> _F:
+    """Memoize ``fn`` for the rest of the current request."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache = _request_cache.get()
+        if cache is None:
+            return fn(*args, **kwargs)
+        key = (fn.__name__, args, frozenset(kwargs.items()))
+        if key in cache:
+            value = cache[key]
+        else:
+            value = cache[key] = fn(*args, **kwargs)
+        # Hand out a private copy so callers cannot mutate the memoized value.
+        return deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _invalidates_request_cache(fn: _F) -> _F:
+    """Clear the current request's read cache after ``fn`` writes."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            cache = _request_cache.get()
+            if cache:
+                cache.clear()
+
+    return wrapper  # type: ignore[return-value]
 
 _BASELINE_FILES: Dict[int, str] = {
     6: "6th_grade.json",
@@ -29,6 +151,10 @@ _BASELINE_FILES: Dict[int, str] = {
 class User(UserMixin):
     """Flask-Login compatible user wrapper."""
 
+    # UserMixin defines no slots, so instances can still get a __dict__; but
+    # with every attribute slotted, one is never materialised in practice.
+    __slots__ = ("id", "email", "username", "password_hash", "role", "name", "created_at")
+
     def __init__(
         self,
         *,
@@ -54,456 +180,468 @@ class User(UserMixin):
 
 def get_connection():
     """Return a singleton database connection."""
-    global _connection, _backend
-    # If connection exists but _backend is None, something went wrong - reset it
-    if _connection is not None:
-        if _backend is None:
-            # Backend wasn't set - this shouldn't happen, but fix it
-            if "psycopg" in str(type(_connection)):
-                _backend = "postgres"
-            elif "sqlite3" in str(type(_connection)):
-                _backend = "sqlite"
+    global _connection, _backend, _connection_pid
+    conn = _connection
+    if (
+        conn is not None
+        and _connection_pid == os.getpid()
+        and not conn.closed
+        and conn.info.transaction_status != TransactionStatus.INERROR
+    ):
+        return conn
+
+    with _conn_lock:
+        if _connection is not None and _connection_pid != os.getpid():
+            # Inherited across fork (e.g. gunicorn --preload); never reuse or close
+            # the parent's socket, just open a fresh connection in this process.
+            _connection = None
+            _backend = None
+        if _connection is not None and _backend == "postgres":
+            if _connection.closed:
+                reset_engine()
+            elif _connection.info.transaction_status == TransactionStatus.INERROR:
+                _connection.rollback()
+        # If connection exists but _backend is None, something went wrong - reset it
+        if _connection is not None:
+            if _backend is None:
+                # Backend wasn't set - this shouldn't happen, but fix it
+                if "psycopg" in str(type(_connection)):
+                    _backend = "postgres"
+                elif "sqlite3" in str(type(_connection)):
+                    _backend = "sqlite"
+            return _connection
+
+        database_url = _resolve_database_url()
+
+        try:
+            conn = psycopg.connect(
+                database_url,
+                row_factory=dict_row,
+                prepare_threshold=_PREPARE_THRESHOLD,
+            )
+            _connection = conn
+            _connection_pid = os.getpid()
+            _backend = "postgres"
+        except Exception as e:
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.error(f"Failed to connect to PostgreSQL: {e}")
+            raise
+
         return _connection
 
+
+def _resolve_database_url() -> str:
     # CRITICAL: Try to ensure environment is loaded before getting settings
-    # This is a safety net in case get_connection() is called before Flask app initializes
-    import os
+    # This is a safety net in case the DAL is used before Flask app initializes
     if not os.getenv("DATABASE_URL"):
         # Try loading from .env file if not in environment
         try:
-            from pathlib import Path
             from dotenv import load_dotenv
             base_dir = Path(__file__).resolve().parent.parent
             env_path = base_dir / ".env"
             if env_path.exists():
                 load_dotenv(env_path, override=True)
+                get_settings.cache_clear()
         except Exception:
             pass  # If loading fails, continue with current environment
-    
+
     settings = get_settings()
-    
+
     database_url = settings.DATABASE_URL
     if not database_url:
         raise RuntimeError("DATABASE_URL must be set and point to a PostgreSQL instance.")
+    return _normalize_database_url(database_url)
+
+
+def _normalize_database_url(database_url: str) -> str:
     if database_url.startswith("sqlite"):
         raise RuntimeError("SQLite is no longer supported. Provide a PostgreSQL DATABASE_URL.")
-
     if database_url.startswith("postgres://"):
         database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return database_url
+
+
+def _open_pool(conninfo: str) -> ConnectionPool:
+    settings = get_settings()
+    return ConnectionPool(
+        conninfo,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        kwargs={"row_factory": dict_row, "prepare_threshold": _PREPARE_THRESHOLD},
+        open=True,
+    )
+
 
+def _get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, opening it on first use."""
+    global _pool, _pool_pid, _backend
+    pool = _pool
+    if pool is not None and _pool_pid == os.getpid():
+        return pool
+
+    with _conn_lock:
+        if _pool is not None and _pool_pid != os.getpid():
+            # Inherited across fork; the parent's sockets are not ours to use.
+            _pool = None
+        if _pool is None:
+            _pool = _open_pool(_resolve_database_url())
+            _pool_pid = os.getpid()
+            _backend = "postgres"
+        return _pool
+
+
+def _get_read_pool() -> ConnectionPool:
+    """Return the read-replica pool, or the primary pool when no replica is configured."""
+    global _read_pool, _read_pool_pid
+    pool = _read_pool
+    if pool is not None and _read_pool_pid == os.getpid():
+        return pool
+    read_url = get_settings().DATABASE_URL_RO
+    if not read_url:
+        return _get_pool()
+
+    with _conn_lock:
+        if _read_pool is None or _read_pool_pid != os.getpid():
+            _read_pool = _open_pool(_normalize_database_url(read_url))
+            _read_pool_pid = os.getpid()
+        return _read_pool
+
+
+# Connections shared by the DAL calls inside a shared_connection() block,
+# keyed by pool, plus the pools whose shared connection is in use right now.
+# Outside such a block every call borrows its own connection.
+_shared_connections: ContextVar[Optional[tuple[dict, set]]] = ContextVar(
+    "wordbridge_shared_connections", default=None
+)
+
+
+@contextmanager
+def shared_connection() -> Iterator[None]:
+    """Let the DAL calls inside the block share one connection per pool.
+
+    The connections stay checked out until the block exits, so keep it around
+    a sequence of database calls only, never around S3 or OpenAI requests.
+    """
+    if _shared_connections.get() is not None:
+        yield
+        return
+    borrowed: dict = {}
+    token = _shared_connections.set((borrowed, set()))
     try:
-        conn = psycopg.connect(database_url, row_factory=dict_row)
-        _connection = conn
-        _backend = "postgres"
-    except Exception as e:
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to connect to PostgreSQL: {e}")
+        yield
+    finally:
+        _shared_connections.reset(token)
+        for pool, conn in borrowed.items():
+            try:
+                pool.putconn(conn)
+            except Exception:
+                pass  # Pool already closed by reset_engine()
+
+
+@contextmanager
+def _borrow_connection(pool: ConnectionPool) -> Iterator[object]:
+    """Yield a connection from ``pool``, reusing the shared one if available.
+
+    Either way the block is its own transaction: committed on a clean exit and
+    rolled back if it raises, as ``pool.connection()`` does.
+    """
+    shared = _shared_connections.get()
+    if shared is None or pool in shared[1]:
+        # Not sharing, or nested inside a block that is using the shared
+        # connection: committing there would end the outer transaction early.
+        with pool.connection() as conn:
+            yield conn
+        return
+
+    borrowed, in_use = shared
+    conn = borrowed.get(pool)
+    if conn is not None and conn.closed:
+        # Hand the dead connection back so the pool frees its slot.
+        borrowed.pop(pool, None)
+        pool.putconn(conn)
+        conn = None
+    if conn is None:
+        conn = borrowed[pool] = pool.getconn()
+    in_use.add(pool)
+    try:
+        yield conn
+    except BaseException:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg.Error:
+                # Broken connection: hand it back so the pool can discard it.
+                borrowed.pop(pool, None)
+                pool.putconn(conn)
         raise
+    else:
+        if not conn.closed:
+            conn.commit()
+    finally:
+        in_use.discard(pool)
 
-    return _connection
+
+@contextmanager
+def db_cursor(
+    *, autocommit: bool = False, read_only: bool = False
+) -> Iterator[tuple[object, object]]:
+    """Yield ``(conn, cur)`` from a pooled connection, returning it afterwards.
+
+    The connection is committed on a clean exit and rolled back if the block
+    raises, so callers only need to commit when they want to do so early.
+    Pass ``autocommit=True`` for single-statement reads to skip the implicit
+    BEGIN/COMMIT round trips, and ``read_only=True`` for reads that tolerate
+    replica lag so they can be served by ``DATABASE_URL_RO``.
+    """
+    pool = _get_read_pool() if read_only else _get_pool()
+    with _borrow_connection(pool) as conn:
+        if not autocommit:
+            with conn.cursor() as cur:
+                yield conn, cur
+            return
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                yield conn, cur
+        finally:
+            if not conn.closed:
+                conn.autocommit = False
 
 
 def reset_engine() -> None:
-    """Reset the current database connection (used in tests)."""
-    global _connection, _backend
-    if _connection is not None:
+    """Reset the current database connection and pool (used in tests)."""
+    global _connection, _backend, _pool, _read_pool
+    with _conn_lock:
+        if _connection is not None:
+            try:
+                _connection.close()
+            except Exception:
+                pass  # Ignore errors when closing
+        _connection = None
+        if _pool is not None and _pool_pid == os.getpid():
+            try:
+                _pool.close()
+            except Exception:
+                pass  # Ignore errors when closing
+        _pool = None
+        if _read_pool is not None and _read_pool_pid == os.getpid():
+            try:
+                _read_pool.close()
+            except Exception:
+                pass  # Ignore errors when closing
+        _read_pool = None
+        _user_cache.clear()
+        _baseline_words_cache.clear()
+        _badge_cache.clear()
+        _backend = None  # CRITICAL: Reset backend so it gets set correctly on next connection
+
+
+def end_request_transaction() -> None:
+    """Roll back any transaction a request left open on the shared connection."""
+    if _connection is None or _backend != "postgres" or _connection_pid != os.getpid():
+        return
+    if _connection.closed:
+        return
+    if _connection.info.transaction_status in (TransactionStatus.INTRANS, TransactionStatus.INERROR):
         try:
-            _connection.close()
-        except Exception:
-            pass  # Ignore errors when closing
-    _connection = None
-    _backend = None  # CRITICAL: Reset backend so it gets set correctly on next connection
+            _connection.rollback()
+        except psycopg.Error:
+            reset_engine()
+
+
+# Full schema, sent as one multi-statement string so startup is a single round trip.
+_PG_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    username VARCHAR(64) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    role VARCHAR(16) NOT NULL CHECK (role IN ('educator', 'student')),
+    name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS student_profiles (
+    student_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    educator_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8)),
+    class_number INTEGER NOT NULL,
+    vocabulary_level INTEGER NOT NULL DEFAULT 0,
+    last_analyzed_at TIMESTAMP NULL
+);
+
+CREATE TABLE IF NOT EXISTS baseline_words (
+    id SERIAL PRIMARY KEY,
+    word VARCHAR(255) NOT NULL,
+    definition TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8))
+);
+
+CREATE INDEX IF NOT EXISTS idx_baseline_words_grade
+ON baseline_words (grade_level);
+
+CREATE INDEX IF NOT EXISTS idx_student_profiles_educator
+ON student_profiles (educator_id);
+
+CREATE INDEX IF NOT EXISTS idx_student_profiles_class_covering
+ON student_profiles (educator_id, grade_level, class_number)
+INCLUDE (vocabulary_level, student_id);
+
+-- Superseded by idx_student_profiles_class_covering (schema version 2).
+DROP INDEX IF EXISTS idx_student_profiles_class;
+
+CREATE TABLE IF NOT EXISTS uploads (
+    id SERIAL PRIMARY KEY,
+    educator_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    file_path TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    status VARCHAR(16) NOT NULL CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
+    processed_at TIMESTAMP NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_uploads_student
+ON uploads (student_id);
+
+CREATE INDEX IF NOT EXISTS idx_uploads_status
+ON uploads (status);
+
+CREATE INDEX IF NOT EXISTS idx_uploads_student_created
+ON uploads (student_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    upload_id INTEGER NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
+    word VARCHAR(255) NOT NULL,
+    definition TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    difficulty_score INTEGER NOT NULL CHECK (difficulty_score BETWEEN 1 AND 10),
+    example_sentence TEXT NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'rejected')),
+    pinned BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_recommendations_student_created
+ON recommendations (student_id, created_at DESC, id DESC);
+
+-- Superseded by idx_recommendations_student_created (schema version 5).
+DROP INDEX IF EXISTS idx_recommendations_student;
+
+CREATE INDEX IF NOT EXISTS idx_recommendations_upload
+ON recommendations (upload_id);
+
+-- Matches the approved-words list (student, status, pinned-first recency
+-- order) so it reads rows already sorted; also serves status counts.
+CREATE INDEX IF NOT EXISTS idx_recommendations_student_status_pinned
+ON recommendations (student_id, status, pinned DESC, created_at DESC, id DESC);
+
+-- Superseded by idx_recommendations_student_status_pinned (schema version 6).
+DROP INDEX IF EXISTS idx_recommendations_student_status;
+
+-- Quiz candidates: approved words by recency, without the pinned ordering.
+CREATE INDEX IF NOT EXISTS idx_recommendations_approved_created
+ON recommendations (student_id, created_at DESC, id DESC)
+WHERE status = 'approved';
+
+CREATE TABLE IF NOT EXISTS student_progress (
+    student_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    xp INTEGER NOT NULL DEFAULT 0,
+    streak_count INTEGER NOT NULL DEFAULT 0,
+    last_quiz_at TIMESTAMP NULL
+);
+
+CREATE TABLE IF NOT EXISTS badges (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    badge_type VARCHAR(32) NOT NULL CHECK (badge_type IN ('10_words', '50_words', '100_words')),
+    earned_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Collapse any duplicate awards left by concurrent quiz submissions before
+-- making (student_id, badge_type) unique (schema version 3).
+DELETE FROM badges b
+USING badges dup
+WHERE b.student_id = dup.student_id
+  AND b.badge_type = dup.badge_type
+  AND b.id > dup.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_badges_student_type
+ON badges (student_id, badge_type);
+
+-- Superseded by ux_badges_student_type (schema version 3).
+DROP INDEX IF EXISTS idx_badges_student;
+
+CREATE TABLE IF NOT EXISTS word_mastery (
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    word_id INTEGER NOT NULL REFERENCES recommendations(id) ON DELETE CASCADE,
+    mastery_stage VARCHAR(32) NOT NULL CHECK (mastery_stage IN ('practicing', 'nearly_mastered', 'mastered')),
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    last_practiced_at TIMESTAMP NULL,
+    PRIMARY KEY (student_id, word_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_word_mastery_student_stage
+ON word_mastery (student_id, mastery_stage);
+
+-- Superseded by idx_word_mastery_student_stage (schema version 4).
+DROP INDEX IF EXISTS idx_word_mastery_student;
+
+CREATE INDEX IF NOT EXISTS idx_word_mastery_word
+ON word_mastery (word_id);
+
+CREATE TABLE IF NOT EXISTS quiz_attempts (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    word_id INTEGER NOT NULL REFERENCES recommendations(id) ON DELETE CASCADE,
+    correct BOOLEAN NOT NULL,
+    attempted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_quiz_attempts_student
+ON quiz_attempts (student_id);
+
+CREATE INDEX IF NOT EXISTS idx_quiz_attempts_attempted
+ON quiz_attempts (attempted_at);
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version INTEGER NOT NULL
+);
+"""
+
+# Bump whenever _PG_SCHEMA_SQL changes; init_db skips the DDL when the
+# database already records this version.
+_SCHEMA_VERSION = 6
 
 
 def init_db() -> None:
     """Create the users table if it does not already exist."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "postgres":
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id SERIAL PRIMARY KEY,
-                    email VARCHAR(255) UNIQUE NOT NULL,
-                    username VARCHAR(64) UNIQUE NOT NULL,
-                    password_hash VARCHAR(255) NOT NULL,
-                    role VARCHAR(16) NOT NULL CHECK (role IN ('educator', 'student')),
-                    name VARCHAR(255) NOT NULL,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS student_profiles (
-                    student_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
-                    educator_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8)),
-                    class_number INTEGER NOT NULL,
-                    vocabulary_level INTEGER NOT NULL DEFAULT 0,
-                    last_analyzed_at TIMESTAMP NULL
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS baseline_words (
-                    id SERIAL PRIMARY KEY,
-                    word VARCHAR(255) NOT NULL,
-                    definition TEXT NOT NULL,
-                    difficulty INTEGER NOT NULL,
-                    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8))
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_baseline_words_grade
-                ON baseline_words (grade_level);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_student_profiles_educator
-                ON student_profiles (educator_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_student_profiles_class
-                ON student_profiles (educator_id, grade_level, class_number);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS uploads (
-                    id SERIAL PRIMARY KEY,
-                    educator_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    file_path TEXT NOT NULL,
-                    filename TEXT NOT NULL,
-                    status VARCHAR(16) NOT NULL CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
-                    processed_at TIMESTAMP NULL,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_uploads_student
-                ON uploads (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_uploads_status
-                ON uploads (status);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS recommendations (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    upload_id INTEGER NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
-                    word VARCHAR(255) NOT NULL,
-                    definition TEXT NOT NULL,
-                    rationale TEXT NOT NULL,
-                    difficulty_score INTEGER NOT NULL CHECK (difficulty_score BETWEEN 1 AND 10),
-                    example_sentence TEXT NOT NULL,
-                    status VARCHAR(16) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'rejected')),
-                    pinned BOOLEAN NOT NULL DEFAULT FALSE,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_recommendations_student
-                ON recommendations (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_recommendations_upload
-                ON recommendations (upload_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS student_progress (
-                    student_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
-                    xp INTEGER NOT NULL DEFAULT 0,
-                    streak_count INTEGER NOT NULL DEFAULT 0,
-                    last_quiz_at TIMESTAMP NULL
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS badges (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    badge_type VARCHAR(32) NOT NULL CHECK (badge_type IN ('10_words', '50_words', '100_words')),
-                    earned_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_badges_student
-                ON badges (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS word_mastery (
-                    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    word_id INTEGER NOT NULL REFERENCES recommendations(id) ON DELETE CASCADE,
-                    mastery_stage VARCHAR(32) NOT NULL CHECK (mastery_stage IN ('practicing', 'nearly_mastered', 'mastered')),
-                    correct_count INTEGER NOT NULL DEFAULT 0,
-                    last_practiced_at TIMESTAMP NULL,
-                    PRIMARY KEY (student_id, word_id)
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_word_mastery_student
-                ON word_mastery (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_word_mastery_word
-                ON word_mastery (word_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS quiz_attempts (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                    word_id INTEGER NOT NULL REFERENCES recommendations(id) ON DELETE CASCADE,
-                    correct BOOLEAN NOT NULL,
-                    attempted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_quiz_attempts_student
-                ON quiz_attempts (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_quiz_attempts_attempted
-                ON quiz_attempts (attempted_at);
-                """
-            )
-        else:
+    with db_cursor() as (conn, cur):
+        if _backend != "postgres":
             raise RuntimeError("PostgreSQL backend is required for init_db.")
+        try:
+            cur.execute("SELECT version FROM schema_version LIMIT 1;")
+            row = cur.fetchone()
+        except pg_errors.UndefinedTable:
+            conn.rollback()
+            row = None
+        if row is not None and row["version"] == _SCHEMA_VERSION:
+            return
+        with conn.transaction():
+            cur.execute(_PG_SCHEMA_SQL, prepare=False)
             cur.execute(
                 """
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT NOT NULL UNIQUE,
-                    username TEXT NOT NULL UNIQUE,
-                    password_hash TEXT NOT NULL,
-                    role TEXT NOT NULL CHECK (role IN ('educator', 'student')),
-                    name TEXT NOT NULL,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS student_profiles (
-                    student_id INTEGER PRIMARY KEY,
-                    educator_id INTEGER NOT NULL,
-                    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8)),
-                    class_number INTEGER NOT NULL,
-                    vocabulary_level INTEGER NOT NULL DEFAULT 0,
-                    last_analyzed_at TIMESTAMP NULL,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY(educator_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS baseline_words (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL,
-                    definition TEXT NOT NULL,
-                    difficulty INTEGER NOT NULL,
-                    grade_level INTEGER NOT NULL CHECK (grade_level IN (6, 7, 8))
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_baseline_words_grade
-                ON baseline_words (grade_level);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_student_profiles_educator
-                ON student_profiles (educator_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_student_profiles_class
-                ON student_profiles (educator_id, grade_level, class_number);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS uploads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    educator_id INTEGER NOT NULL,
-                    student_id INTEGER NOT NULL,
-                    file_path TEXT NOT NULL,
-                    filename TEXT NOT NULL,
-                    status TEXT NOT NULL CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
-                    processed_at TIMESTAMP NULL,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(educator_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_uploads_student
-                ON uploads (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_uploads_status
-                ON uploads (status);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS recommendations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    upload_id INTEGER NOT NULL,
-                    word TEXT NOT NULL,
-                    definition TEXT NOT NULL,
-                    rationale TEXT NOT NULL,
-                    difficulty_score INTEGER NOT NULL,
-                    example_sentence TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'rejected')),
-                    pinned INTEGER NOT NULL DEFAULT 0,
-                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY(upload_id) REFERENCES uploads(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_recommendations_student
-                ON recommendations (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_recommendations_upload
-                ON recommendations (upload_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS student_progress (
-                    student_id INTEGER PRIMARY KEY,
-                    xp INTEGER NOT NULL DEFAULT 0,
-                    streak_count INTEGER NOT NULL DEFAULT 0,
-                    last_quiz_at TIMESTAMP NULL,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS badges (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    badge_type TEXT NOT NULL CHECK (badge_type IN ('10_words', '50_words', '100_words')),
-                    earned_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_badges_student
-                ON badges (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS word_mastery (
-                    student_id INTEGER NOT NULL,
-                    word_id INTEGER NOT NULL,
-                    mastery_stage TEXT NOT NULL CHECK (mastery_stage IN ('practicing', 'nearly_mastered', 'mastered')),
-                    correct_count INTEGER NOT NULL DEFAULT 0,
-                    last_practiced_at TIMESTAMP NULL,
-                    PRIMARY KEY(student_id, word_id),
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY(word_id) REFERENCES recommendations(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_word_mastery_student
-                ON word_mastery (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_word_mastery_word
-                ON word_mastery (word_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS quiz_attempts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    word_id INTEGER NOT NULL,
-                    correct INTEGER NOT NULL,
-                    attempted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(student_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY(word_id) REFERENCES recommendations(id) ON DELETE CASCADE
-                );
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_quiz_attempts_student
-                ON quiz_attempts (student_id);
-                """
-            )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_quiz_attempts_attempted
-                ON quiz_attempts (attempted_at);
-                """
+                INSERT INTO schema_version (id, version) VALUES (TRUE, %s)
+                ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version;
+                """,
+                (_SCHEMA_VERSION,),
             )
-        conn.commit()
-    finally:
-        cur.close()
 
 
 def _row_to_user(row: Optional[dict]) -> Optional[User]:
@@ -525,42 +663,219 @@ def _row_to_user(row: Optional[dict]) -> Optional[User]:
     )
 
 
+_USER_COLUMNS = "id, email, username, password_hash, role, name, created_at"
+
+# Statements for the pooled (PostgreSQL-only) code paths, keyed by name so each
+# call reuses one prebuilt string instead of choosing a dialect per call.
+_SQL: Dict[str, str] = {
+    "user_by_id": f"SELECT {_USER_COLUMNS} FROM users WHERE id = %s",
+    # UNION ALL lets each branch use its own unique index; an OR across the two
+    # columns would not. Email matches come first.
+    "user_by_identifier": f"""
+        SELECT {_USER_COLUMNS} FROM users WHERE email = %s
+        UNION ALL
+        SELECT {_USER_COLUMNS} FROM users WHERE username = %s
+        LIMIT 1
+    """,
+    "insert_user": """
+        INSERT INTO users (name, email, username, password_hash, role)
+        VALUES (%s, %s, %s, %s, %s)
+        RETURNING id;
+    """,
+    "delete_user": "DELETE FROM users WHERE id = %s;",
+    "count_baseline_for_grade": "SELECT COUNT(*) FROM baseline_words WHERE grade_level = %s;",
+    "insert_student_profile": """
+        INSERT INTO student_profiles (
+            student_id,
+            educator_id,
+            grade_level,
+            class_number,
+            vocabulary_level
+        ) VALUES (%s, %s, %s, %s, %s);
+    """,
+    "update_vocabulary_level": """
+        UPDATE student_profiles
+        SET vocabulary_level = %s
+        WHERE student_id = %s;
+    """,
+    "list_students_for_educator": """
+        SELECT u.id, u.name, u.username, sp.grade_level, sp.class_number
+        FROM student_profiles sp
+        JOIN users u ON u.id = sp.student_id
+        WHERE sp.educator_id = %s
+        ORDER BY u.name ASC;
+    """,
+    "ensure_student_progress": """
+        INSERT INTO student_progress (student_id) VALUES (%s)
+        ON CONFLICT (student_id) DO NOTHING;
+    """,
+    "student_progress": """
+        SELECT student_id, xp, streak_count, last_quiz_at
+        FROM student_progress
+        WHERE student_id = %s;
+    """,
+    "badges_for_student": """
+        SELECT id, badge_type, earned_at
+        FROM badges
+        WHERE student_id = %s
+        ORDER BY earned_at ASC, id ASC;
+    """,
+    "approved_words_for_student": """
+        SELECT
+            id,
+            word,
+            definition,
+            rationale,
+            difficulty_score,
+            example_sentence,
+            pinned,
+            created_at
+        FROM recommendations
+        WHERE student_id = %s AND status = 'approved'
+        ORDER BY pinned DESC, created_at DESC, id DESC
+        LIMIT %s OFFSET %s;
+    """,
+    "approved_words_with_mastery": """
+        SELECT
+            r.id,
+            r.word,
+            r.definition,
+            r.rationale,
+            r.difficulty_score,
+            r.example_sentence,
+            r.pinned,
+            r.created_at,
+            wm.word_id AS mastery_word_id,
+            wm.mastery_stage,
+            wm.correct_count,
+            wm.last_practiced_at
+        FROM recommendations r
+        LEFT JOIN word_mastery wm
+            ON wm.student_id = r.student_id
+            AND wm.word_id = r.id
+        WHERE r.student_id = %s AND r.status = 'approved'
+        ORDER BY r.pinned DESC, r.created_at DESC, r.id DESC
+        LIMIT %s OFFSET %s;
+    """,
+    "word_mastery_for_student": """
+        SELECT
+            student_id,
+            word_id,
+            mastery_stage,
+            correct_count,
+            last_practiced_at
+        FROM word_mastery
+        WHERE student_id = %s
+        ORDER BY word_id ASC;
+    """,
+    "quiz_candidates": """
+        SELECT
+            r.id,
+            r.word,
+            r.definition,
+            r.example_sentence,
+            r.created_at,
+            COALESCE(wm.correct_count, 0) AS correct_count,
+            wm.mastery_stage,
+            wm.last_practiced_at
+        FROM recommendations r
+        LEFT JOIN word_mastery wm
+            ON wm.student_id = r.student_id
+            AND wm.word_id = r.id
+        WHERE r.student_id = %s
+          AND r.status = 'approved'
+          AND (wm.correct_count IS NULL OR wm.correct_count < 3)
+        ORDER BY r.created_at DESC, r.id DESC
+        LIMIT %s;
+    """,
+    # Creates the row on first use; the no-op DO UPDATE locks an existing row
+    # and returns it, so one statement replaces SELECT ... FOR UPDATE + INSERT.
+    "student_progress_for_update": """
+        INSERT INTO student_progress (student_id) VALUES (%s)
+        ON CONFLICT (student_id) DO UPDATE SET student_id = excluded.student_id
+        RETURNING xp, streak_count, last_quiz_at;
+    """,
+    # Applies a quiz's (word_id, increment) pairs in one statement: the stage
+    # thresholds mirror the 3-correct mastery rule, and the final SELECT counts
+    # words that crossed into 'mastered' with this quiz.
+    "apply_word_mastery": """
+        WITH input AS (
+            SELECT word_id, increment
+            FROM unnest(%s::int[], %s::int[]) AS t(word_id, increment)
+        ),
+        prev AS (
+            SELECT
+                input.word_id,
+                LEAST(3, COALESCE(wm.correct_count, 0) + input.increment) AS new_correct,
+                COALESCE(wm.mastery_stage, 'practicing') AS old_stage
+            FROM input
+            LEFT JOIN word_mastery wm
+                ON wm.student_id = %s AND wm.word_id = input.word_id
+        ),
+        upserted AS (
+            INSERT INTO word_mastery (
+                student_id,
+                word_id,
+                mastery_stage,
+                correct_count,
+                last_practiced_at
+            )
+            SELECT
+                %s,
+                word_id,
+                CASE
+                    WHEN new_correct >= 3 THEN 'mastered'
+                    WHEN new_correct >= 2 THEN 'nearly_mastered'
+                    ELSE 'practicing'
+                END,
+                new_correct,
+                %s
+            FROM prev
+            ON CONFLICT (student_id, word_id) DO UPDATE
+            SET mastery_stage = excluded.mastery_stage,
+                correct_count = excluded.correct_count,
+                last_practiced_at = excluded.last_practiced_at
+            RETURNING word_id, mastery_stage
+        )
+        SELECT COUNT(*) AS mastered_gained
+        FROM upserted
+        JOIN prev ON prev.word_id = upserted.word_id
+        WHERE upserted.mastery_stage = 'mastered' AND prev.old_stage <> 'mastered';
+    """,
+    "count_mastered_words": """
+        SELECT COUNT(*) AS total
+        FROM word_mastery
+        WHERE student_id = %s
+          AND mastery_stage = 'mastered';
+    """,
+}
+
+
 def _execute_fetchone(query: str, params: tuple) -> Optional[dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            query = query.replace("%s", "?")
+    with db_cursor(autocommit=True) as (conn, cur):
         cur.execute(query, params)
-        row = cur.fetchone()
-        if row is None:
-            return None
-        if _backend == "sqlite":
-            row = dict(row)
-        return row
-    finally:
-        cur.close()
+        return cur.fetchone()
 
 
 def get_user_by_id(user_id: int) -> Optional[User]:
-    row = _execute_fetchone(
-        "SELECT * FROM users WHERE id = %s",
-        (user_id,),
-    )
-    return _row_to_user(row)
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = _row_to_user(_execute_fetchone(_SQL["user_by_id"], (user_id,)))
+    if user is not None:
+        _user_cache.set(user_id, user)
+    return user
 
 
 def get_user_by_identifier(identifier: str) -> Optional[User]:
     if not identifier:
         return None
 
-    row = _execute_fetchone(
-        "SELECT * FROM users WHERE email = %s OR username = %s",
-        (identifier, identifier),
-    )
+    row = _execute_fetchone(_SQL["user_by_identifier"], (identifier, identifier))
     return _row_to_user(row)
 
 
+@_invalidates_request_cache
 def create_user(
     *,
     name: str,
@@ -573,34 +888,17 @@ def create_user(
     if normalized_role not in {"educator", "student"}:
         raise ValueError("Role must be 'educator' or 'student'.")
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "postgres":
+    with db_cursor() as (conn, cur):
+        try:
             cur.execute(
-                """
-                INSERT INTO users (name, email, username, password_hash, role)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id;
-                """,
+                _SQL["insert_user"],
                 (name, email, username, password_hash, normalized_role),
             )
             new_id = cur.fetchone()["id"]
-        else:
-            cur.execute(
-                """
-                INSERT INTO users (name, email, username, password_hash, role)
-                VALUES (?, ?, ?, ?, ?);
-                """,
-                (name, email, username, password_hash, normalized_role),
-            )
-            new_id = cur.lastrowid
-        conn.commit()
-    except (sqlite3.IntegrityError, pg_errors.UniqueViolation) as exc:
-        conn.rollback()
-        raise ValueError("Email or username already in use.") from exc
-    finally:
-        cur.close()
+            conn.commit()
+        except pg_errors.UniqueViolation as exc:
+            conn.rollback()
+            raise ValueError("Email or username already in use.") from exc
 
     user = get_user_by_id(new_id)
     if user is None:
@@ -608,18 +906,14 @@ def create_user(
     return user
 
 
+@_invalidates_request_cache
 def delete_user(user_id: int) -> None:
     """Delete a user and all their associated data via CASCADE."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute("DELETE FROM users WHERE id = ?;", (user_id,))
-        else:
-            cur.execute("DELETE FROM users WHERE id = %s;", (user_id,))
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["delete_user"], (user_id,))
         conn.commit()
-    finally:
-        cur.close()
+    _user_cache.pop(user_id)
+    _badge_cache.pop(user_id)
 
 
 def _default_baseline_dir() -> Path:
@@ -680,96 +974,76 @@ def _fallback_baseline_words(grade_level: int) -> list[dict[str, object]]:
     return entries
 
 
+@lru_cache(maxsize=4)
+def _load_baseline_records(base_dir: Path) -> tuple[tuple[str, str, int, int], ...]:
+    """Parse and validate the baseline files once per directory per process."""
+    records: list[tuple[str, str, int, int]] = []
+
+    for grade_level, filename in _BASELINE_FILES.items():
+        # A missing file surfaces as FileNotFoundError (an OSError), so there is
+        # no separate exists() stat before opening.
+        try:
+            with (base_dir / filename).open("r", encoding="utf-8") as handle:
+                words = json.load(handle)
+        except (json.JSONDecodeError, OSError):
+            words = _fallback_baseline_words(grade_level)
+
+        for entry in words:
+            word = (entry.get("word") or "").strip()
+            definition = (entry.get("definition") or "").strip()
+            if not word or not definition:
+                continue
+            difficulty = entry.get("difficulty", 3)
+            try:
+                difficulty_int = int(difficulty)
+            except (TypeError, ValueError):
+                difficulty_int = 3
+            records.append(
+                (
+                    word,
+                    definition,
+                    difficulty_int,
+                    int(entry.get("grade_level", grade_level)),
+                )
+            )
+
+    return tuple(records)
+
+
 def ensure_baseline_words_loaded(
     baseline_dir: str | os.PathLike[str] | None = None,
 ) -> None:
     """Load baseline vocabulary data if the table is empty."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute("SELECT COUNT(*) FROM baseline_words;")
-        existing_row = cur.fetchone()
-        if _row_to_scalar(existing_row) > 0:
+    with db_cursor() as (conn, cur):
+        cur.execute("SELECT 1 FROM baseline_words LIMIT 1;")
+        if cur.fetchone() is not None:
             return
 
         base_dir = Path(baseline_dir) if baseline_dir else _default_baseline_dir()
-        records: list[tuple[str, str, int, int]] = []
-
-        for grade_level, filename in _BASELINE_FILES.items():
-            file_path = base_dir / filename
-            if file_path.exists():
-                try:
-                    with file_path.open("r", encoding="utf-8") as handle:
-                        words = json.load(handle)
-                except (json.JSONDecodeError, OSError):
-                    words = _fallback_baseline_words(grade_level)
-            else:
-                words = _fallback_baseline_words(grade_level)
-
-            for entry in words:
-                word = (entry.get("word") or "").strip()
-                definition = (entry.get("definition") or "").strip()
-                if not word or not definition:
-                    continue
-                difficulty = entry.get("difficulty", 3)
-                try:
-                    difficulty_int = int(difficulty)
-                except (TypeError, ValueError):
-                    difficulty_int = 3
-                records.append(
-                    (
-                        word,
-                        definition,
-                        difficulty_int,
-                        int(entry.get("grade_level", grade_level)),
-                    )
-                )
+        records = _load_baseline_records(base_dir)
 
         if not records:
             return
 
-        if _backend == "sqlite":
-            cur.executemany(
-                """
-                INSERT INTO baseline_words (word, definition, difficulty, grade_level)
-                VALUES (?, ?, ?, ?)
-                """,
-                records,
-            )
-        else:
-            cur.executemany(
-                """
-                INSERT INTO baseline_words (word, definition, difficulty, grade_level)
-                VALUES (%s, %s, %s, %s)
-                """,
-                records,
-            )
+        with cur.copy(
+            "COPY baseline_words (word, definition, difficulty, grade_level) FROM STDIN"
+        ) as copy:
+            write_row = copy.write_row
+            for record in records:
+                write_row(record)
         conn.commit()
-    finally:
-        cur.close()
-
-
-def count_baseline_words_for_grade(grade_level: int) -> int:
-    """Return the number of baseline words present for a grade level."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                "SELECT COUNT(*) FROM baseline_words WHERE grade_level = ?;",
-                (grade_level,),
-            )
-        else:
-            cur.execute(
-                "SELECT COUNT(*) FROM baseline_words WHERE grade_level = %s;",
-                (grade_level,),
-            )
+    _baseline_words_cache.clear()
+
+
+def count_baseline_words_for_grade(grade_level: int) -> int:
+    """Return the number of baseline words present for a grade level."""
+    with db_cursor(autocommit=True) as (conn, cur):
+        cur.execute(_SQL["count_baseline_for_grade"], (grade_level,))
         row = cur.fetchone()
         return int(_row_to_scalar(row))
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def create_student_profile(
     *,
     student_id: int,
@@ -779,46 +1053,19 @@ def create_student_profile(
     vocabulary_level: int = 0,
 ) -> None:
     """Create a student profile entry linked to an educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                INSERT INTO student_profiles (
-                    student_id,
-                    educator_id,
-                    grade_level,
-                    class_number,
-                    vocabulary_level
-                ) VALUES (?, ?, ?, ?, ?);
-                """,
-                (student_id, educator_id, grade_level, class_number, vocabulary_level),
-            )
-        else:
+    with db_cursor() as (conn, cur):
+        try:
             cur.execute(
-                """
-                INSERT INTO student_profiles (
-                    student_id,
-                    educator_id,
-                    grade_level,
-                    class_number,
-                    vocabulary_level
-                ) VALUES (%s, %s, %s, %s, %s);
-                """,
+                _SQL["insert_student_profile"],
                 (student_id, educator_id, grade_level, class_number, vocabulary_level),
             )
-        conn.commit()
-    except sqlite3.IntegrityError as exc:
-        conn.rollback()
-        raise ValueError("Student profile already exists.") from exc
-    except pg_errors.UniqueViolation as exc:
-        conn.rollback()
-        raise ValueError("Student profile already exists.") from exc
-    finally:
-        cur.close()
+            conn.commit()
+        except pg_errors.UniqueViolation as exc:
+            conn.rollback()
+            raise ValueError("Student profile already exists.") from exc
 
 
+@_invalidates_request_cache
 def update_student_vocabulary_level(student_id: int, new_level: int) -> None:
     """Persist an updated vocabulary level for the given student."""
     try:
@@ -827,171 +1074,51 @@ def update_student_vocabulary_level(student_id: int, new_level: int) -> None:
         level_value = 0
     level_value = max(0, level_value)
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                UPDATE student_profiles
-                SET vocabulary_level = ?
-                WHERE student_id = ?;
-                """,
-                (level_value, student_id),
-            )
-        else:
-            cur.execute(
-                """
-                UPDATE student_profiles
-                SET vocabulary_level = %s
-                WHERE student_id = %s;
-                """,
-                (level_value, student_id),
-            )
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["update_vocabulary_level"], (level_value, student_id))
         conn.commit()
-    finally:
-        cur.close()
 
 
 def list_students_for_educator(educator_id: int) -> list[dict[str, object]]:
     """Return students belonging to an educator ordered by name."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT u.id, u.name, u.username, sp.grade_level, sp.class_number
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ?
-                ORDER BY u.name ASC;
-                """,
-                (educator_id,),
-            )
-            rows = cur.fetchall()
-            return [dict(row) for row in rows] if rows else []
-        cur.execute(
-            """
-            SELECT u.id, u.name, u.username, sp.grade_level, sp.class_number
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s
-            ORDER BY u.name ASC;
-            """,
-            (educator_id,),
-        )
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["list_students_for_educator"], (educator_id,))
         rows = cur.fetchall()
         return rows or []
-    finally:
-        cur.close()
-
-
-def count_students_for_educator(educator_id: int) -> int:
-    """Return number of students linked to the educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT COUNT(*) AS total
-                FROM student_profiles
-                WHERE educator_id = ?;
-                """,
-                (educator_id,),
-            )
-            row = cur.fetchone()
-            return int(row["total"] if row else 0)
-        cur.execute(
-            """
-            SELECT COUNT(*) AS total
-            FROM student_profiles
-            WHERE educator_id = %s;
-            """,
-            (educator_id,),
-        )
-        row = cur.fetchone()
-        return int(row["total"] if row else 0)
-    finally:
-        cur.close()
 
 
-def count_pending_recommendations_for_educator(educator_id: int) -> int:
-    """Return count of pending recommendations for the educator's students."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT COUNT(*) AS total
-                FROM recommendations r
-                JOIN student_profiles sp ON sp.student_id = r.student_id
-                WHERE sp.educator_id = ? AND r.status = 'pending';
-                """,
-                (educator_id,),
-            )
-            row = cur.fetchone()
-            return int(row["total"] if row else 0)
+def get_educator_dashboard_stats(educator_id: int) -> dict[str, object]:
+    """Return the student count and pending recommendations in one query."""
+    # Read from the primary: the dashboard lists students from the primary
+    # too, and replica lag would let the counts disagree with those rows.
+    with db_cursor() as (conn, cur):
         cur.execute(
             """
-            SELECT COUNT(*) AS total
-            FROM recommendations r
-            JOIN student_profiles sp ON sp.student_id = r.student_id
-            WHERE sp.educator_id = %s AND r.status = 'pending';
+            SELECT
+                (
+                    SELECT COUNT(*)
+                    FROM student_profiles
+                    WHERE educator_id = %s
+                ) AS total_students,
+                (
+                    SELECT COUNT(*)
+                    FROM recommendations r
+                    JOIN student_profiles sp ON sp.student_id = r.student_id
+                    WHERE sp.educator_id = %s AND r.status = 'pending'
+                ) AS pending_recommendations;
             """,
-            (educator_id,),
+            (educator_id, educator_id),
         )
-        row = cur.fetchone()
-        return int(row["total"] if row else 0)
-    finally:
-        cur.close()
-
-
-def average_vocabulary_level_for_educator(educator_id: int) -> float:
-    """Return average vocabulary level for the educator's students."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT AVG(vocabulary_level) AS avg_level
-                FROM student_profiles
-                WHERE educator_id = ?;
-                """,
-                (educator_id,),
-            )
-            row = cur.fetchone()
-            value = row["avg_level"] if row else None
-        else:
-            cur.execute(
-                """
-                SELECT AVG(vocabulary_level) AS avg_level
-                FROM student_profiles
-                WHERE educator_id = %s;
-                """,
-                (educator_id,),
-            )
-            row = cur.fetchone()
-            value = row["avg_level"] if row else None
-
-        if value is None:
-            return 0.0
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return 0.0
-    finally:
-        cur.close()
+        row = cur.fetchone() or {}
+        return {
+            "total_students": int(row.get("total_students") or 0),
+            "pending_recommendations": int(row.get("pending_recommendations") or 0),
+        }
 
 
 def average_vocabulary_level_for_grade(educator_id: int, grade_level: int) -> float:
     """Return average vocabulary level for a specific grade."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor(read_only=True) as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 """
@@ -1021,17 +1148,13 @@ def average_vocabulary_level_for_grade(educator_id: int, grade_level: int) -> fl
             return float(value)
         except (TypeError, ValueError):
             return 0.0
-    finally:
-        cur.close()
 
 
 def average_vocabulary_level_for_class(
     educator_id: int, grade_level: int, class_number: int
 ) -> float:
     """Return average vocabulary level for a specific class."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor(read_only=True) as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 """
@@ -1061,556 +1184,223 @@ def average_vocabulary_level_for_class(
             return float(value)
         except (TypeError, ValueError):
             return 0.0
-    finally:
-        cur.close()
-
-
-def list_students_with_stats_for_educator(
-    educator_id: int,
-) -> list[dict[str, object]]:
-    """Return students for educator with pending count and last upload timestamp."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT
-                    u.id AS student_id,
-                    u.name,
-                    u.username,
-                    sp.grade_level,
-                    sp.class_number,
-                    sp.vocabulary_level,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                    ) AS pending_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                    ) AS approved_words,
-                    (
-                        SELECT MAX(created_at)
-                        FROM uploads up
-                        WHERE up.student_id = sp.student_id
-                    ) AS last_upload_at
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ?
-                ORDER BY sp.grade_level ASC, sp.class_number ASC, u.name ASC;
-                """,
-                (educator_id,),
-            )
-            rows = cur.fetchall() or []
-            return [
-                {
-                    "id": row["student_id"],
-                    "name": row["name"],
-                    "username": row["username"],
-                    "grade_level": row["grade_level"],
-                    "class_number": row["class_number"],
-                    "vocabulary_level": row["vocabulary_level"],
-                    "pending_words": row["pending_words"] or 0,
-                    "approved_words": row["approved_words"] or 0,
-                    "last_upload_at": row["last_upload_at"],
-                }
-                for row in rows
-            ]
-        cur.execute(
-            """
-            SELECT
-                u.id AS student_id,
-                u.name,
-                u.username,
-                sp.grade_level,
-                sp.class_number,
-                sp.vocabulary_level,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                ) AS pending_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                ) AS approved_words,
-                (
-                    SELECT MAX(created_at)
-                    FROM uploads up
-                    WHERE up.student_id = sp.student_id
-                ) AS last_upload_at
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s
-            ORDER BY sp.grade_level ASC, sp.class_number ASC, u.name ASC;
-            """,
-            (educator_id,),
-        )
-        rows = cur.fetchall() or []
-        return [
-            {
-                "id": row["student_id"],
-                "name": row["name"],
-                "username": row["username"],
-                "grade_level": row["grade_level"],
-                "class_number": row["class_number"],
-                "vocabulary_level": row["vocabulary_level"],
-                "pending_words": row["pending_words"] or 0,
-                "approved_words": row["approved_words"] or 0,
-                "last_upload_at": row["last_upload_at"],
-            }
-            for row in rows
-        ]
-    finally:
-        cur.close()
-
-
-def list_students_with_stats_for_grade(
-    educator_id: int, grade_level: int
-) -> list[dict[str, object]]:
-    """Return students for an educator filtered by grade."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT
-                    u.id AS student_id,
-                    u.name,
-                    u.username,
-                    sp.grade_level,
-                    sp.class_number,
-                    sp.vocabulary_level,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                    ) AS pending_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                    ) AS approved_words,
-                    (
-                        SELECT MAX(created_at)
-                        FROM uploads up
-                        WHERE up.student_id = sp.student_id
-                    ) AS last_upload_at
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ? AND sp.grade_level = ?
-                ORDER BY sp.class_number ASC, u.name ASC;
-                """,
-                (educator_id, grade_level),
-            )
-            rows = cur.fetchall() or []
-            return [
-                {
-                    "id": row["student_id"],
-                    "name": row["name"],
-                    "username": row["username"],
-                    "grade_level": row["grade_level"],
-                    "class_number": row["class_number"],
-                    "vocabulary_level": row["vocabulary_level"],
-                    "pending_words": row["pending_words"] or 0,
-                    "last_upload_at": row["last_upload_at"],
-                }
-                for row in rows
-            ]
-        cur.execute(
-            """
-            SELECT
-                u.id AS student_id,
-                u.name,
-                u.username,
-                sp.grade_level,
-                sp.class_number,
-                sp.vocabulary_level,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                ) AS pending_words,
-                (
-                    SELECT MAX(created_at)
-                    FROM uploads up
-                    WHERE up.student_id = sp.student_id
-                ) AS last_upload_at
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s AND sp.grade_level = %s
-            ORDER BY sp.class_number ASC, u.name ASC;
-            """,
-            (educator_id, grade_level),
-        )
-        rows = cur.fetchall() or []
-        return [
-            {
-                "id": row["student_id"],
-                "name": row["name"],
-                "username": row["username"],
-                "grade_level": row["grade_level"],
-                "class_number": row["class_number"],
-                "vocabulary_level": row["vocabulary_level"],
-                "pending_words": row["pending_words"] or 0,
-                "approved_words": row["approved_words"] or 0,
-                "last_upload_at": row["last_upload_at"],
-            }
-            for row in rows
-        ]
-    finally:
-        cur.close()
 
 
-def list_students_with_stats_for_class(
-    educator_id: int, grade_level: int, class_number: int
-) -> list[dict[str, object]]:
-    """Return students for an educator filtered by grade and class."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT
-                    u.id AS student_id,
-                    u.name,
-                    u.username,
-                    sp.grade_level,
-                    sp.class_number,
-                    sp.vocabulary_level,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                    ) AS pending_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                    ) AS approved_words,
-                    (
-                        SELECT MAX(created_at)
-                        FROM uploads up
-                        WHERE up.student_id = sp.student_id
-                    ) AS last_upload_at
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ? AND sp.grade_level = ? AND sp.class_number = ?
-                ORDER BY u.name ASC;
-                """,
-                (educator_id, grade_level, class_number),
-            )
-            rows = cur.fetchall() or []
-            return [
-                {
-                    "id": row["student_id"],
-                    "name": row["name"],
-                    "username": row["username"],
-                    "grade_level": row["grade_level"],
-                    "class_number": row["class_number"],
-                    "vocabulary_level": row["vocabulary_level"],
-                    "pending_words": row["pending_words"] or 0,
-                    "approved_words": row["approved_words"] or 0,
-                    "last_upload_at": row["last_upload_at"],
-                }
-                for row in rows
-            ]
-        cur.execute(
-            """
-            SELECT
-                u.id AS student_id,
-                u.name,
-                u.username,
-                sp.grade_level,
-                sp.class_number,
-                sp.vocabulary_level,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                ) AS pending_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                ) AS approved_words,
-                (
-                    SELECT MAX(created_at)
-                    FROM uploads up
-                    WHERE up.student_id = sp.student_id
-                ) AS last_upload_at
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s AND sp.grade_level = %s AND sp.class_number = %s
-            ORDER BY u.name ASC;
-            """,
-            (educator_id, grade_level, class_number),
-        )
-        rows = cur.fetchall() or []
-        return [
-            {
-                "id": row["student_id"],
-                "name": row["name"],
-                "username": row["username"],
-                "grade_level": row["grade_level"],
-                "class_number": row["class_number"],
-                "vocabulary_level": row["vocabulary_level"],
-                "pending_words": row["pending_words"] or 0,
-                "approved_words": row["approved_words"] or 0,
-                "last_upload_at": row["last_upload_at"],
-            }
-            for row in rows
-        ]
-    finally:
-        cur.close()
-
+# Aggregates are computed only over the filtered roster, so one grouped pass
+# over each child table replaces three correlated subqueries per student.
+_STUDENTS_WITH_STATS_SQL = """
+    WITH roster AS (
+        SELECT student_id, educator_id, grade_level, class_number, vocabulary_level
+        FROM student_profiles
+        WHERE {where}
+    ),
+    rec AS (
+        SELECT
+            r.student_id,
+            COUNT(*) FILTER (WHERE r.status = 'pending') AS pending_words,
+            COUNT(*) FILTER (WHERE r.status = 'approved') AS approved_words
+        FROM recommendations r
+        JOIN roster ON roster.student_id = r.student_id
+        GROUP BY r.student_id
+    ),
+    latest_upload AS (
+        SELECT up.student_id, MAX(up.created_at) AS last_upload_at
+        FROM uploads up
+        JOIN roster ON roster.student_id = up.student_id
+        GROUP BY up.student_id
+    )
+    SELECT
+        u.id AS student_id,
+        roster.educator_id,
+        u.name,
+        u.username,
+        roster.grade_level,
+        roster.class_number,
+        roster.vocabulary_level,
+        COALESCE(rec.pending_words, 0) AS pending_words,
+        COALESCE(rec.approved_words, 0) AS approved_words,
+        latest_upload.last_upload_at
+    FROM roster
+    JOIN users u ON u.id = roster.student_id
+    LEFT JOIN rec ON rec.student_id = roster.student_id
+    LEFT JOIN latest_upload ON latest_upload.student_id = roster.student_id
+    ORDER BY {order_by};
+"""
+
+_STUDENTS_WITH_STATS_FOR_EDUCATOR_SQL = _STUDENTS_WITH_STATS_SQL.format(
+    where="educator_id = %s",
+    order_by="roster.grade_level ASC, roster.class_number ASC, u.name ASC",
+)
+_STUDENTS_WITH_STATS_FOR_GRADE_SQL = _STUDENTS_WITH_STATS_SQL.format(
+    where="educator_id = %s AND grade_level = %s",
+    order_by="roster.class_number ASC, u.name ASC",
+)
+_STUDENTS_WITH_STATS_FOR_CLASS_SQL = _STUDENTS_WITH_STATS_SQL.format(
+    where="educator_id = %s AND grade_level = %s AND class_number = %s",
+    order_by="u.name ASC",
+)
+_STUDENTS_WITH_STATS_FOR_EDUCATORS_SQL = _STUDENTS_WITH_STATS_SQL.format(
+    where="educator_id = ANY(%s)",
+    order_by="roster.educator_id ASC, roster.grade_level ASC, roster.class_number ASC, u.name ASC",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class StudentStatsRow:
+    """One student in an educator roster, with recommendation and upload stats."""
+
+    id: int
+    name: str
+    username: str
+    grade_level: int
+    class_number: int
+    vocabulary_level: int
+    pending_words: int
+    approved_words: int
+    last_upload_at: Optional[datetime.datetime]
+
+    def to_dict(self) -> dict[str, object]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _student_stats_entry(row: tuple) -> StudentStatsRow:
+    # Columns follow _STUDENTS_WITH_STATS_SQL; row[1] is the educator_id.
+    return StudentStatsRow(row[0], *row[2:])
+
+
+def _fetch_student_stats_rows(query: str, params: tuple) -> list[tuple]:
+    # Roster rows map positionally onto StudentStatsRow, so fetch plain tuples
+    # instead of building (and then discarding) a dict per student.
+    with db_cursor() as (conn, cur):
+        cur.row_factory = tuple_row
+        cur.execute(query, params)
+        return cur.fetchall() or []
 
-def get_student_overview_by_username(
-    educator_id: int, username: str
-) -> Optional[dict[str, object]]:
-    """Return student profile summary by username if it belongs to the educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT
-                    u.id AS student_id,
-                    u.name,
-                    u.email,
-                    u.username,
-                    sp.grade_level,
-                    sp.class_number,
-                    sp.vocabulary_level,
-                    sp.last_analyzed_at,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                    ) AS pending_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                    ) AS approved_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'rejected'
-                    ) AS rejected_words,
-                    (
-                        SELECT MAX(created_at)
-                        FROM uploads up
-                        WHERE up.student_id = sp.student_id
-                    ) AS last_upload_at
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ? AND u.username = ?;
-                """,
-                (educator_id, username),
-            )
-            row = cur.fetchone()
-            if row is None:
-                return None
-            return {
-                "student_id": row["student_id"],
-                "name": row["name"],
-                "email": row["email"],
-                "username": row["username"],
-                "grade_level": row["grade_level"],
-                "class_number": row["class_number"],
-                "vocabulary_level": row["vocabulary_level"],
-                "last_analyzed_at": row["last_analyzed_at"],
-                "pending_words": row["pending_words"] or 0,
-                "approved_words": row["approved_words"] or 0,
-                "rejected_words": row["rejected_words"] or 0,
-                "last_upload_at": row["last_upload_at"],
-            }
-        cur.execute(
-            """
-            SELECT
-                u.id AS student_id,
-                u.name,
-                u.email,
-                u.username,
-                sp.grade_level,
-                sp.class_number,
-                sp.vocabulary_level,
-                sp.last_analyzed_at,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                ) AS pending_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                ) AS approved_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'rejected'
-                ) AS rejected_words,
-                (
-                    SELECT MAX(created_at)
-                    FROM uploads up
-                    WHERE up.student_id = sp.student_id
-                ) AS last_upload_at
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s AND u.username = %s;
-            """,
-            (educator_id, username),
-        )
+
+def _list_students_with_stats(query: str, params: tuple) -> list[StudentStatsRow]:
+    return [_student_stats_entry(row) for row in _fetch_student_stats_rows(query, params)]
+
+
+def list_students_with_stats_for_educator(
+    educator_id: int,
+) -> list[StudentStatsRow]:
+    """Return students for educator with pending count and last upload timestamp."""
+    return _list_students_with_stats(_STUDENTS_WITH_STATS_FOR_EDUCATOR_SQL, (educator_id,))
+
+
+def list_students_with_stats_for_grade(
+    educator_id: int, grade_level: int
+) -> list[StudentStatsRow]:
+    """Return students for an educator filtered by grade."""
+    return _list_students_with_stats(
+        _STUDENTS_WITH_STATS_FOR_GRADE_SQL, (educator_id, grade_level)
+    )
+
+
+def list_students_with_stats_for_class(
+    educator_id: int, grade_level: int, class_number: int
+) -> list[StudentStatsRow]:
+    """Return students for an educator filtered by grade and class."""
+    return _list_students_with_stats(
+        _STUDENTS_WITH_STATS_FOR_CLASS_SQL, (educator_id, grade_level, class_number)
+    )
+
+
+def list_students_with_stats_for_educators(
+    educator_ids: Sequence[int],
+) -> dict[int, list[StudentStatsRow]]:
+    """Return students with stats for several educators in one query, keyed by educator."""
+    unique_ids = list(dict.fromkeys(int(educator_id) for educator_id in educator_ids))
+    grouped: dict[int, list[StudentStatsRow]] = {educator_id: [] for educator_id in unique_ids}
+    if not unique_ids:
+        return grouped
+    rows = _fetch_student_stats_rows(_STUDENTS_WITH_STATS_FOR_EDUCATORS_SQL, (unique_ids,))
+    for row in rows:
+        grouped[row[1]].append(_student_stats_entry(row))
+    return grouped
+
+
+# Each LATERAL aggregate runs once for the single matched student, so the
+# recommendations are read in one pass instead of three correlated counts.
+_STUDENT_OVERVIEW_SQL = """
+    SELECT
+        u.id AS student_id,
+        u.name,
+        u.email,
+        u.username,
+        sp.grade_level,
+        sp.class_number,
+        sp.vocabulary_level,
+        sp.last_analyzed_at,
+        rec.pending_words,
+        rec.approved_words,
+        rec.rejected_words,
+        latest_upload.last_upload_at
+    FROM student_profiles sp
+    JOIN users u ON u.id = sp.student_id
+    CROSS JOIN LATERAL (
+        SELECT
+            COUNT(*) FILTER (WHERE r.status = 'pending') AS pending_words,
+            COUNT(*) FILTER (WHERE r.status = 'approved') AS approved_words,
+            COUNT(*) FILTER (WHERE r.status = 'rejected') AS rejected_words
+        FROM recommendations r
+        WHERE r.student_id = sp.student_id
+    ) rec
+    CROSS JOIN LATERAL (
+        SELECT MAX(up.created_at) AS last_upload_at
+        FROM uploads up
+        WHERE up.student_id = sp.student_id
+    ) latest_upload
+    WHERE {where};
+"""
+
+_STUDENT_OVERVIEW_BY_USERNAME_SQL = _STUDENT_OVERVIEW_SQL.format(
+    where="sp.educator_id = %s AND u.username = %s"
+)
+_STUDENT_OVERVIEW_BY_ID_SQL = _STUDENT_OVERVIEW_SQL.format(
+    where="sp.educator_id = %s AND sp.student_id = %s"
+)
+
+
+def _fetch_student_overview(query: str, params: tuple) -> Optional[dict[str, object]]:
+    with db_cursor() as (conn, cur):
+        cur.execute(query, params)
         row = cur.fetchone()
-        if row is None:
-            return None
-        return {
-            "student_id": row["student_id"],
-            "name": row["name"],
-            "email": row["email"],
-            "username": row["username"],
-            "grade_level": row["grade_level"],
-            "class_number": row["class_number"],
-            "vocabulary_level": row["vocabulary_level"],
-            "last_analyzed_at": row["last_analyzed_at"],
-            "pending_words": row["pending_words"] or 0,
-            "approved_words": row["approved_words"] or 0,
-            "rejected_words": row["rejected_words"] or 0,
-            "last_upload_at": row["last_upload_at"],
-        }
-    finally:
-        cur.close()
+    if row is None:
+        return None
+    return {
+        "student_id": row["student_id"],
+        "name": row["name"],
+        "email": row["email"],
+        "username": row["username"] or "",
+        "grade_level": row["grade_level"],
+        "class_number": row["class_number"],
+        "vocabulary_level": row["vocabulary_level"],
+        "last_analyzed_at": row["last_analyzed_at"],
+        "pending_words": row["pending_words"] or 0,
+        "approved_words": row["approved_words"] or 0,
+        "rejected_words": row["rejected_words"] or 0,
+        "last_upload_at": row["last_upload_at"],
+    }
 
 
+@_request_cached
+def get_student_overview_by_username(
+    educator_id: int, username: str
+) -> Optional[dict[str, object]]:
+    """Return student profile summary by username if it belongs to the educator."""
+    return _fetch_student_overview(_STUDENT_OVERVIEW_BY_USERNAME_SQL, (educator_id, username))
+
+
+@_request_cached
 def get_student_overview(
     educator_id: int, student_id: int
 ) -> Optional[dict[str, object]]:
     """Return student profile summary if it belongs to the educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT
-                    u.id AS student_id,
-                    u.name,
-                    u.email,
-                    u.username,
-                    sp.grade_level,
-                    sp.class_number,
-                    sp.vocabulary_level,
-                    sp.last_analyzed_at,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                    ) AS pending_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                    ) AS approved_words,
-                    (
-                        SELECT COUNT(*)
-                        FROM recommendations r
-                        WHERE r.student_id = sp.student_id AND r.status = 'rejected'
-                    ) AS rejected_words,
-                    (
-                        SELECT MAX(created_at)
-                        FROM uploads up
-                        WHERE up.student_id = sp.student_id
-                    ) AS last_upload_at
-                FROM student_profiles sp
-                JOIN users u ON u.id = sp.student_id
-                WHERE sp.educator_id = ? AND sp.student_id = ?;
-                """,
-                (educator_id, student_id),
-            )
-            row = cur.fetchone()
-            if row is None:
-                return None
-            return {
-                "student_id": row["student_id"],
-                "name": row["name"],
-                "email": row["email"],
-                "username": row.get("username", ""),
-                "grade_level": row["grade_level"],
-                "class_number": row["class_number"],
-                "vocabulary_level": row["vocabulary_level"],
-                "last_analyzed_at": row["last_analyzed_at"],
-                "pending_words": row["pending_words"] or 0,
-                "approved_words": row["approved_words"] or 0,
-                "rejected_words": row["rejected_words"] or 0,
-                "last_upload_at": row["last_upload_at"],
-            }
-        cur.execute(
-            """
-            SELECT
-                u.id AS student_id,
-                u.name,
-                u.email,
-                u.username,
-                sp.grade_level,
-                sp.class_number,
-                sp.vocabulary_level,
-                sp.last_analyzed_at,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'pending'
-                ) AS pending_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'approved'
-                ) AS approved_words,
-                (
-                    SELECT COUNT(*)
-                    FROM recommendations r
-                    WHERE r.student_id = sp.student_id AND r.status = 'rejected'
-                ) AS rejected_words,
-                (
-                    SELECT MAX(created_at)
-                    FROM uploads up
-                    WHERE up.student_id = sp.student_id
-                ) AS last_upload_at
-            FROM student_profiles sp
-            JOIN users u ON u.id = sp.student_id
-            WHERE sp.educator_id = %s AND sp.student_id = %s;
-            """,
-            (educator_id, student_id),
-        )
-        row = cur.fetchone()
-        if row is None:
-            return None
-        return {
-            "student_id": row["student_id"],
-            "name": row["name"],
-            "email": row["email"],
-            "username": row.get("username", ""),
-            "grade_level": row["grade_level"],
-            "class_number": row["class_number"],
-            "vocabulary_level": row["vocabulary_level"],
-            "last_analyzed_at": row["last_analyzed_at"],
-            "pending_words": row["pending_words"] or 0,
-            "approved_words": row["approved_words"] or 0,
-            "rejected_words": row["rejected_words"] or 0,
-            "last_upload_at": row["last_upload_at"],
-        }
-    finally:
-        cur.close()
+    return _fetch_student_overview(_STUDENT_OVERVIEW_BY_ID_SQL, (educator_id, student_id))
 
 
+@_invalidates_request_cache
 def create_upload_record(
     *,
     educator_id: int,
@@ -1620,20 +1410,7 @@ def create_upload_record(
     status: str = "pending",
 ) -> int:
     """Insert a new upload row and return its identifier."""
-    # CRITICAL: Ensure environment is loaded before resetting connection
-    # This ensures DATABASE_URL is available when get_connection() is called
-    from config.settings import get_settings
-    _ = get_settings()  # This ensures environment is loaded
-    
-    # CRITICAL: Reset connection to ensure we use the correct database
-    # This is especially important when called from Flask routes
-    reset_engine()
-    
-    conn = get_connection()
-    # _backend is set by get_connection(), access it as a global
-    global _backend
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 """
@@ -1657,8 +1434,6 @@ def create_upload_record(
         if new_id is None:
             raise RuntimeError("Upload was created but no identifier returned.")
         return int(new_id)
-    finally:
-        cur.close()
 
 
 def update_upload_status(
@@ -1667,37 +1442,38 @@ def update_upload_status(
     processed_at: Optional[datetime.datetime] = None,
 ) -> None:
     """Update status (and optionally processed timestamp) for an upload."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                UPDATE uploads
-                SET status = ?, processed_at = COALESCE(?, processed_at)
-                WHERE id = ?;
-                """,
-                (status, processed_at, upload_id),
-            )
-        else:
-            cur.execute(
-                """
-                UPDATE uploads
-                SET status = %s, processed_at = COALESCE(%s, processed_at)
-                WHERE id = %s;
-                """,
-                (status, processed_at, upload_id),
-            )
+    update_upload_statuses([(upload_id, status, processed_at)])
+
+
+@_invalidates_request_cache
+def update_upload_statuses(
+    items: Sequence[tuple[int, str, Optional[datetime.datetime]]],
+) -> None:
+    """Apply ``(upload_id, status, processed_at)`` updates in one statement and commit."""
+    if not items:
+        return
+    upload_ids = [int(item[0]) for item in items]
+    statuses = [item[1] for item in items]
+    processed = [item[2] for item in items]
+
+    with db_cursor() as (conn, cur):
+        cur.execute(
+            """
+            UPDATE uploads AS u
+            SET status = v.status, processed_at = COALESCE(v.processed_at, u.processed_at)
+            FROM unnest(%s::integer[], %s::varchar[], %s::timestamp[])
+                AS v(id, status, processed_at)
+            WHERE u.id = v.id;
+            """,
+            (upload_ids, statuses, processed),
+        )
         conn.commit()
-    finally:
-        cur.close()
 
 
+@_request_cached
 def get_upload_status(upload_id: int) -> Optional[str]:
     """Return upload status string or None if not found."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 "SELECT status FROM uploads WHERE id = ?;",
@@ -1717,15 +1493,12 @@ def get_upload_status(upload_id: int) -> Optional[str]:
         if row is None:
             return None
         return str(row["status"])
-    finally:
-        cur.close()
 
 
+@_request_cached
 def get_upload_by_id(upload_id: int) -> Optional[dict[str, object]]:
     """Return upload metadata row or None."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 "SELECT * FROM uploads WHERE id = ?;",
@@ -1738,118 +1511,100 @@ def get_upload_by_id(upload_id: int) -> Optional[dict[str, object]]:
             (upload_id,),
         )
         row = cur.fetchone()
-        return row if row else None
-    finally:
-        cur.close()
+    return dict(row) if row else None
+
+
+_UPLOADS_FOR_STUDENT_SQL = """
+    SELECT id, educator_id, student_id, file_path, filename, status,
+           processed_at, created_at
+    FROM uploads
+    WHERE student_id = %s
+    ORDER BY created_at DESC;
+"""
 
 
 def list_uploads_for_student(student_id: int) -> list[dict[str, object]]:
     """Return all uploads for a student, ordered by most recent first."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT id, educator_id, student_id, file_path, filename, status, 
-                       processed_at, created_at
-                FROM uploads
-                WHERE student_id = ?
-                ORDER BY created_at DESC;
-                """,
-                (student_id,),
-            )
-            rows = cur.fetchall() or []
-            return [dict(row) for row in rows]
-        cur.execute(
-            """
-            SELECT id, educator_id, student_id, file_path, filename, status, 
-                   processed_at, created_at
-            FROM uploads
-            WHERE student_id = %s
-            ORDER BY created_at DESC;
-            """,
-            (student_id,),
-        )
-        rows = cur.fetchall() or []
-        return rows
-    finally:
-        cur.close()
+    with db_cursor() as (conn, cur):
+        cur.execute(_UPLOADS_FOR_STUDENT_SQL, (student_id,))
+        return cur.fetchall() or []
+
+
+def iter_uploads_for_student(
+    student_id: int, *, chunk_size: int = 500
+) -> Iterator[dict[str, object]]:
+    """Yield a student's uploads newest first, fetching ``chunk_size`` rows at a time.
+
+    Uses a server-side cursor, so memory stays bounded however many uploads
+    exist; the pooled connection is held until the iterator is exhausted or closed.
+    """
+    # Deliberately bypasses the request's shared connection: the server-side
+    # cursor lives inside a transaction that any interleaved db_cursor() commit
+    # would close, so the iterator keeps a connection of its own.
+    with _get_pool().connection() as conn:
+        with conn.cursor(name="iter_uploads_for_student") as cur:
+            cur.itersize = chunk_size
+            cur.execute(_UPLOADS_FOR_STUDENT_SQL, (student_id,))
+            yield from cur
 
 
+@_invalidates_request_cache
 def delete_upload(upload_id: int) -> None:
     """Delete an upload and its associated recommendations, S3 file, and any SQS messages."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        # First, get the file path before deleting the record
-        if _backend == "sqlite":
-            cur.execute("SELECT file_path FROM uploads WHERE id = ?;", (upload_id,))
-        else:
-            cur.execute("SELECT file_path FROM uploads WHERE id = %s;", (upload_id,))
+    # recommendations.upload_id is ON DELETE CASCADE, so one statement removes
+    # the upload and its recommendations atomically.
+    with db_cursor() as (conn, cur):
+        cur.execute("DELETE FROM uploads WHERE id = %s RETURNING file_path;", (upload_id,))
         row = cur.fetchone()
-        file_path = row.get("file_path") if row else None
-        
-        # Delete recommendations associated with this upload
-        delete_recommendations_for_upload(upload_id)
-        
-        # Delete the upload record from database
-        if _backend == "sqlite":
-            cur.execute("DELETE FROM uploads WHERE id = ?;", (upload_id,))
-        else:
-            cur.execute("DELETE FROM uploads WHERE id = %s;", (upload_id,))
-        conn.commit()
-        
-        # Delete S3 file if it exists
-        if file_path and file_path.startswith("s3://"):
-            try:
-                from config.settings import get_settings
-                import boto3
-                from urllib.parse import urlparse
-                import logging
-                
-                logger = logging.getLogger(__name__)
-                settings = get_settings()
-                # Parse s3://bucket/key format
-                parsed = urlparse(file_path)
-                bucket_name = parsed.netloc
-                s3_key = parsed.path.lstrip("/")
-                
-                # Delete from S3 - use same region extraction logic as queue
-                region_name = "us-east-2"  # Default region
-                # Try to extract region from SQS queue URL if available
-                if settings.AWS_SQS_QUEUE_URL:
-                    try:
-                        from urllib.parse import urlparse
-                        parsed_sqs = urlparse(settings.AWS_SQS_QUEUE_URL)
-                        hostname_parts = parsed_sqs.hostname.split(".")
-                        if len(hostname_parts) >= 2 and hostname_parts[0] == "sqs":
-                            region_name = hostname_parts[1]
-                    except Exception:
-                        pass
-                
-                s3_client = boto3.client(
-                    "s3",
-                    region_name=region_name,
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                )
-                s3_client.delete_object(Bucket=bucket_name, Key=s3_key)
-                logger.info("Deleted S3 file: %s", file_path)
-            except Exception as s3_error:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning("Failed to delete S3 file %s: %s", file_path, s3_error)
-                # Don't fail the whole delete operation if S3 delete fails
-    finally:
-        cur.close()
-
+    file_path = row.get("file_path") if row else None
 
+    # Delete S3 file if it exists
+    if file_path and file_path.startswith("s3://"):
+        try:
+            from config.settings import get_settings
+            import boto3
+            from urllib.parse import urlparse
+            import logging
+            
+            logger = logging.getLogger(__name__)
+            settings = get_settings()
+            # Parse s3://bucket/key format
+            parsed = urlparse(file_path)
+            bucket_name = parsed.netloc
+            s3_key = parsed.path.lstrip("/")
+            
+            # Delete from S3 - use same region extraction logic as queue
+            region_name = "us-east-2"  # Default region
+            # Try to extract region from SQS queue URL if available
+            if settings.AWS_SQS_QUEUE_URL:
+                try:
+                    from urllib.parse import urlparse
+                    parsed_sqs = urlparse(settings.AWS_SQS_QUEUE_URL)
+                    hostname_parts = parsed_sqs.hostname.split(".")
+                    if len(hostname_parts) >= 2 and hostname_parts[0] == "sqs":
+                        region_name = hostname_parts[1]
+                except Exception:
+                    pass
+            
+            s3_client = boto3.client(
+                "s3",
+                region_name=region_name,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            )
+            s3_client.delete_object(Bucket=bucket_name, Key=s3_key)
+            logger.info("Deleted S3 file: %s", file_path)
+        except Exception as s3_error:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning("Failed to delete S3 file %s: %s", file_path, s3_error)
+            # Don't fail the whole delete operation if S3 delete fails
+
+
+@_request_cached
 def get_student_profile(student_id: int) -> Optional[dict[str, object]]:
     """Return a student profile row joined with user metadata."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 """
@@ -1888,47 +1643,33 @@ def get_student_profile(student_id: int) -> Optional[dict[str, object]]:
             (student_id,),
         )
         row = cur.fetchone()
-        return row if row else None
-    finally:
-        cur.close()
+    return dict(row) if row else None
 
 
+@_invalidates_request_cache
 def touch_student_profile_analysis(
     student_id: int, analyzed_at: Optional[datetime.datetime] = None
 ) -> None:
-    """Update the last analyzed timestamp for a student profile."""
-    conn = get_connection()
-    cur = conn.cursor()
-    timestamp = analyzed_at or datetime.datetime.utcnow()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                UPDATE student_profiles
-                SET last_analyzed_at = ?
-                WHERE student_id = ?;
-                """,
-                (timestamp, student_id),
-            )
-        else:
-            cur.execute(
-                """
-                UPDATE student_profiles
-                SET last_analyzed_at = %s
-                WHERE student_id = %s;
-                """,
-                (timestamp, student_id),
-            )
+    """Update the last analyzed timestamp for a student profile.
+
+    When ``analyzed_at`` is omitted the database clock (UTC) is used.
+    """
+    with db_cursor() as (conn, cur):
+        cur.execute(
+            """
+            UPDATE student_profiles
+            SET last_analyzed_at = COALESCE(%s, timezone('UTC', NOW()))
+            WHERE student_id = %s;
+            """,
+            (analyzed_at, student_id),
+        )
         conn.commit()
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def delete_recommendations_for_upload(upload_id: int) -> None:
     """Remove recommendations associated with an upload."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 "DELETE FROM recommendations WHERE upload_id = ?;",
@@ -1940,10 +1681,15 @@ def delete_recommendations_for_upload(upload_id: int) -> None:
                 (upload_id,),
             )
         conn.commit()
-    finally:
-        cur.close()
 
 
+# Required keys of a recommendation record, fetched in one C-level call.
+_RECOMMENDATION_FIELDS = itemgetter(
+    "word", "definition", "rationale", "difficulty_score", "example_sentence"
+)
+
+
+@_invalidates_request_cache
 def create_recommendations(
     *,
     student_id: int,
@@ -1954,296 +1700,166 @@ def create_recommendations(
     if not records:
         return
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.executemany(
-                """
-                INSERT INTO recommendations (
-                    word,
-                    definition,
-                    rationale,
-                    difficulty_score,
-                    example_sentence,
-                    status,
-                    pinned,
-                    student_id,
-                    upload_id
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-                """,
-                [
-                    (
-                        rec["word"],
-                        rec["definition"],
-                        rec["rationale"],
-                        int(rec["difficulty_score"]),
-                        rec["example_sentence"],
-                        rec.get("status", "pending"),
-                        1 if rec.get("pinned", False) else 0,
-                        student_id,
-                        upload_id,
-                    )
-                    for rec in records
-                ],
-            )
-        else:
-            cur.executemany(
-                """
-                INSERT INTO recommendations (
-                    word,
-                    definition,
-                    rationale,
-                    difficulty_score,
-                    example_sentence,
-                    status,
-                    pinned,
-                    student_id,
-                    upload_id
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
-                """,
-                [
+    with db_cursor() as (conn, cur):
+        # COPY streams the whole batch in one round trip.
+        with cur.copy(
+            """
+            COPY recommendations (
+                word,
+                definition,
+                rationale,
+                difficulty_score,
+                example_sentence,
+                status,
+                pinned,
+                student_id,
+                upload_id
+            ) FROM STDIN
+            """
+        ) as copy:
+            write_row = copy.write_row
+            for rec in records:
+                word, definition, rationale, difficulty, example = _RECOMMENDATION_FIELDS(rec)
+                write_row(
                     (
-                        rec["word"],
-                        rec["definition"],
-                        rec["rationale"],
-                        int(rec["difficulty_score"]),
-                        rec["example_sentence"],
+                        word,
+                        definition,
+                        rationale,
+                        int(difficulty),
+                        example,
                         rec.get("status", "pending"),
                         bool(rec.get("pinned", False)),
                         student_id,
                         upload_id,
                     )
-                    for rec in records
-                ],
-            )
+                )
         conn.commit()
-    finally:
-        cur.close()
+
+
+_RECOMMENDATIONS_FOR_UPLOAD_SQL = """
+    SELECT id,
+           student_id,
+           upload_id,
+           word,
+           definition,
+           rationale,
+           difficulty_score,
+           example_sentence,
+           status,
+           pinned,
+           created_at
+    FROM recommendations
+    WHERE upload_id = %s
+    ORDER BY created_at ASC;
+"""
 
 
 def list_recommendations_for_upload(upload_id: int) -> list[dict[str, object]]:
     """Return recommendations created for the given upload."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if _backend == "sqlite":
-            cur.execute(
-                """
-                SELECT id,
-                       student_id,
-                       upload_id,
-                       word,
-                       definition,
-                       rationale,
-                       difficulty_score,
-                       example_sentence,
-                       status,
-                       pinned,
-                       created_at
-                FROM recommendations
-                WHERE upload_id = ?
-                ORDER BY created_at ASC;
-                """,
-                (upload_id,),
-            )
-            rows = cur.fetchall() or []
-            return [dict(row) for row in rows]
-        cur.execute(
-            """
-            SELECT id,
-                   student_id,
-                   upload_id,
-                   word,
-                   definition,
-                   rationale,
-                   difficulty_score,
-                   example_sentence,
-                   status,
-                   pinned,
-                   created_at
-            FROM recommendations
-            WHERE upload_id = %s
-            ORDER BY created_at ASC;
-            """,
-            (upload_id,),
-        )
-        rows = cur.fetchall() or []
-        return rows
-    finally:
-        cur.close()
+    with db_cursor() as (conn, cur):
+        cur.execute(_RECOMMENDATIONS_FOR_UPLOAD_SQL, (upload_id,))
+        return cur.fetchall() or []
+
 
+def iter_recommendations_for_upload(
+    upload_id: int, *, chunk_size: int = 1000
+) -> Iterator[dict[str, object]]:
+    """Yield an upload's recommendations oldest first, ``chunk_size`` rows at a time.
 
+    Like :func:`iter_uploads_for_student`, this holds a pooled connection
+    with a server-side cursor until the iterator is exhausted or closed.
+    """
+    # Own connection, not the request's; see iter_uploads_for_student.
+    with _get_pool().connection() as conn:
+        with conn.cursor(name="iter_recommendations_for_upload") as cur:
+            cur.itersize = chunk_size
+            cur.execute(_RECOMMENDATIONS_FOR_UPLOAD_SQL, (upload_id,))
+            yield from cur
+
+
+@_invalidates_request_cache
 def ensure_student_progress_row(student_id: int) -> None:
     """Ensure a student progress row exists for the student."""
-    conn = get_connection()
-    cur = conn.cursor()
-    select_query = "SELECT 1 FROM student_progress WHERE student_id = %s;"
-    insert_query = "INSERT INTO student_progress (student_id) VALUES (%s);"
-    if _backend == "sqlite":
-        select_query = select_query.replace("%s", "?")
-        insert_query = insert_query.replace("%s", "?")
-    try:
-        cur.execute(select_query, (student_id,))
-        existing = cur.fetchone()
-        if existing is not None:
-            return
-        cur.execute(insert_query, (student_id,))
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["ensure_student_progress"], (student_id,))
         conn.commit()
-    finally:
-        cur.close()
 
 
 def get_student_progress(student_id: int) -> Optional[dict[str, object]]:
     """Return the student progress row if it exists."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT student_id, xp, streak_count, last_quiz_at
-        FROM student_progress
-        WHERE student_id = %s;
-    """
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, (student_id,))
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["student_progress"], (student_id,))
         row = cur.fetchone()
         if row is None:
             return None
         if _backend == "sqlite":
             return dict(row)
         return row  # type: ignore[return-value]
-    finally:
-        cur.close()
 
 
 def list_badges_for_student(student_id: int) -> list[dict[str, object]]:
     """Return badges earned by the student ordered by earn date."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT id, badge_type, earned_at
-        FROM badges
-        WHERE student_id = %s
-        ORDER BY earned_at ASC, id ASC;
-    """
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, (student_id,))
+    cached = _badge_cache.get(student_id)
+    if cached is not None:
+        return [dict(row) for row in cached]
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["badges_for_student"], (student_id,))
+        rows = [dict(row) for row in cur.fetchall() or []]
+    _badge_cache.set(student_id, tuple(rows))
+    return [dict(row) for row in rows]
+
+
+def list_approved_words_for_student(
+    student_id: int,
+    *,
+    limit: int = 200,
+    offset: int = 0,
+) -> list[dict[str, object]]:
+    """Return approved recommendations for the student."""
+    params: tuple[object, ...] = (student_id, limit, offset)
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["approved_words_for_student"], params)
         rows = cur.fetchall() or []
         if _backend == "sqlite":
             return [dict(row) for row in rows]
         return rows  # type: ignore[return-value]
-    finally:
-        cur.close()
 
 
-def list_approved_words_for_student(
+def list_approved_words_with_mastery(
     student_id: int,
     *,
     limit: int = 200,
     offset: int = 0,
 ) -> list[dict[str, object]]:
-    """Return approved recommendations for the student."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT
-            id,
-            word,
-            definition,
-            rationale,
-            difficulty_score,
-            example_sentence,
-            pinned,
-            created_at
-        FROM recommendations
-        WHERE student_id = %s AND status = 'approved'
-        ORDER BY pinned DESC, created_at DESC, id DESC
-        LIMIT %s OFFSET %s;
-    """
+    """Return approved recommendations joined with the student's mastery rows."""
     params: tuple[object, ...] = (student_id, limit, offset)
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, params)
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["approved_words_with_mastery"], params)
         rows = cur.fetchall() or []
-        normalized: list[dict[str, object]] = []
-        for row in rows:
-            if _backend == "sqlite":
-                normalized.append(dict(row))
-            else:
-                normalized.append(dict(row))
-        return normalized
-    finally:
-        cur.close()
+        if _backend == "sqlite":
+            return [dict(row) for row in rows]
+        return rows  # type: ignore[return-value]
 
 
 def list_word_mastery_for_student(student_id: int) -> list[dict[str, object]]:
     """Return word mastery progress for the student."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT
-            student_id,
-            word_id,
-            mastery_stage,
-            correct_count,
-            last_practiced_at
-        FROM word_mastery
-        WHERE student_id = %s
-        ORDER BY word_id ASC;
-    """
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, (student_id,))
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["word_mastery_for_student"], (student_id,))
         rows = cur.fetchall() or []
         if _backend == "sqlite":
             return [dict(row) for row in rows]
         return rows  # type: ignore[return-value]
-    finally:
-        cur.close()
 
 
 def list_quiz_candidates(student_id: int, limit: int = 200) -> list[dict[str, object]]:
     """Return approved words that are not yet mastered for quiz generation."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT
-            r.id,
-            r.word,
-            r.definition,
-            r.example_sentence,
-            r.created_at,
-            COALESCE(wm.correct_count, 0) AS correct_count,
-            wm.mastery_stage,
-            wm.last_practiced_at
-        FROM recommendations r
-        LEFT JOIN word_mastery wm
-            ON wm.student_id = r.student_id
-            AND wm.word_id = r.id
-        WHERE r.student_id = %s
-          AND r.status = 'approved'
-          AND (wm.correct_count IS NULL OR wm.correct_count < 3)
-        ORDER BY r.created_at DESC, r.id DESC
-        LIMIT %s;
-    """
     params: tuple[object, ...] = (student_id, limit)
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, params)
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["quiz_candidates"], params)
         rows = cur.fetchall() or []
         if _backend == "sqlite":
             return [dict(row) for row in rows]
         return rows  # type: ignore[return-value]
-    finally:
-        cur.close()
 
 
 def get_student_recommendations_by_ids(
@@ -2254,26 +1870,21 @@ def get_student_recommendations_by_ids(
     if not word_ids:
         return {}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    placeholders = ", ".join(["%s"] * len(word_ids))
-    query = f"""
-        SELECT id, word, definition, example_sentence, difficulty_score
-        FROM recommendations
-        WHERE student_id = %s
-          AND status = 'approved'
-          AND id IN ({placeholders});
-    """
-    params: list[object] = [student_id, *word_ids]
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, tuple(params))
+    with db_cursor() as (conn, cur):
+        # One array parameter keeps a single prepared statement for any count.
+        cur.execute(
+            """
+            SELECT id, word, definition, example_sentence, difficulty_score
+            FROM recommendations
+            WHERE student_id = %s
+              AND status = 'approved'
+              AND id = ANY(%s::int[]);
+            """,
+            (student_id, list(word_ids)),
+        )
         rows = cur.fetchall() or []
         result: dict[int, dict[str, object]] = {}
         for row in rows:
-            if _backend == "sqlite":
-                row = dict(row)
             result[int(row["id"])] = {
                 "id": row["id"],
                 "word": row["word"],
@@ -2282,10 +1893,44 @@ def get_student_recommendations_by_ids(
                 "difficulty_score": row.get("difficulty_score"),
             }
         return result
-    finally:
-        cur.close()
 
 
+_INVALID = object()
+
+
+def _coerce_int(value: object) -> object:
+    """Return ``int(value)``, or ``_INVALID`` when it cannot be converted."""
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return _INVALID
+
+
+def _insert_quiz_attempts(
+    cur,
+    student_id: int,
+    attempts: Sequence[dict[str, object]],
+    timestamp: datetime.datetime,
+) -> None:
+    # One pass: coerce each word_id once and drop entries without a valid one.
+    valid_attempts = (
+        (word_id, bool(entry.get("correct")))
+        for entry in attempts
+        if (word_id := _coerce_int(entry.get("word_id"))) is not _INVALID
+    )
+
+    # Binary COPY with declared column types; rows are written as they are
+    # validated, so no intermediate list of tuples is built.
+    with cur.copy(
+        "COPY quiz_attempts (student_id, word_id, correct, attempted_at) FROM STDIN (FORMAT BINARY)"
+    ) as copy:
+        copy.set_types(["int4", "int4", "bool", "timestamp"])
+        write_row = copy.write_row
+        for word_id, correct in valid_attempts:
+            write_row((student_id, word_id, correct, timestamp))
+
+
+@_invalidates_request_cache
 def record_quiz_attempts(
     *,
     student_id: int,
@@ -2297,11 +1942,21 @@ def record_quiz_attempts(
         return
 
     timestamp = attempted_at or datetime.datetime.utcnow()
-    conn = get_connection()
-    cur = conn.cursor()
-    rows: list[tuple[object, ...]] = []
+    with db_cursor() as (conn, cur):
+        _insert_quiz_attempts(cur, student_id, attempts, timestamp)
+        conn.commit()
 
-    for entry in attempts:
+
+def _apply_word_mastery_results(
+    cur,
+    student_id: int,
+    results: Sequence[dict[str, object]],
+    timestamp: datetime.datetime,
+) -> dict[str, object]:
+    updated_ids: list[int] = []
+    increments: dict[int, int] = {}
+
+    for entry in results:
         word_id_raw = entry.get("word_id")
         if word_id_raw is None:
             continue
@@ -2309,38 +1964,30 @@ def record_quiz_attempts(
             word_id = int(word_id_raw)
         except (TypeError, ValueError):
             continue
-        correct = bool(entry.get("correct"))
-        if _backend == "sqlite":
-            rows.append((student_id, word_id, 1 if correct else 0, timestamp))
-        else:
-            rows.append((student_id, word_id, correct, timestamp))
 
-    if not rows:
-        cur.close()
-        return
+        increment = entry.get("increment", 0)
+        try:
+            increment_value = int(increment)
+        except (TypeError, ValueError):
+            increment_value = 0
+        # Counts only grow and are capped, so repeated words can be summed.
+        increments[word_id] = increments.get(word_id, 0) + max(0, increment_value)
+        updated_ids.append(word_id)
 
-    try:
-        if _backend == "sqlite":
-            cur.executemany(
-                """
-                INSERT INTO quiz_attempts (student_id, word_id, correct, attempted_at)
-                VALUES (?, ?, ?, ?);
-                """,
-                rows,
-            )
-        else:
-            cur.executemany(
-                """
-                INSERT INTO quiz_attempts (student_id, word_id, correct, attempted_at)
-                VALUES (%s, %s, %s, %s);
-                """,
-                rows,
-            )
-        conn.commit()
-    finally:
-        cur.close()
+    if not increments:
+        return {"mastered_gained": 0, "updated_ids": []}
+
+    cur.execute(
+        _SQL["apply_word_mastery"],
+        (list(increments), list(increments.values()), student_id, student_id, timestamp),
+    )
+    row = cur.fetchone()
+    mastered_gained = int(row["mastered_gained"]) if row else 0
+
+    return {"mastered_gained": mastered_gained, "updated_ids": updated_ids}
 
 
+@_invalidates_request_cache
 def update_word_mastery_from_results(
     *,
     student_id: int,
@@ -2352,141 +1999,21 @@ def update_word_mastery_from_results(
         return {"mastered_gained": 0, "updated_ids": []}
 
     timestamp = attempted_at or datetime.datetime.utcnow()
-    conn = get_connection()
-    cur = conn.cursor()
-    mastered_gained = 0
-    updated_ids: list[int] = []
-
-    select_query = """
-        SELECT mastery_stage, correct_count
-        FROM word_mastery
-        WHERE student_id = %s AND word_id = %s;
-    """
-    if _backend == "sqlite":
-        select_query = select_query.replace("%s", "?")
-
-    try:
-        for entry in results:
-            word_id_raw = entry.get("word_id")
-            if word_id_raw is None:
-                continue
-            try:
-                word_id = int(word_id_raw)
-            except (TypeError, ValueError):
-                continue
-
-            increment = entry.get("increment", 0)
-            try:
-                increment_value = int(increment)
-            except (TypeError, ValueError):
-                increment_value = 0
-            increment_value = max(0, increment_value)
-
-            cur.execute(select_query, (student_id, word_id))
-            row = cur.fetchone()
-            if row is not None and _backend == "sqlite":
-                row = dict(row)
-
-            existing_correct = 0
-            existing_stage = "practicing"
-            if row:
-                existing_correct = int(row.get("correct_count") or 0)
-                existing_stage = str(row.get("mastery_stage") or "practicing")
-
-            new_correct = existing_correct + increment_value
-            if new_correct > 3:
-                new_correct = 3
-
-            if new_correct >= 3:
-                new_stage = "mastered"
-            elif new_correct >= 2:
-                new_stage = "nearly_mastered"
-            else:
-                new_stage = "practicing"
-
-            is_new_mastered = new_stage == "mastered" and existing_stage != "mastered"
-
-            if row:
-                if _backend == "sqlite":
-                    cur.execute(
-                        """
-                        UPDATE word_mastery
-                        SET mastery_stage = ?, correct_count = ?, last_practiced_at = ?
-                        WHERE student_id = ? AND word_id = ?;
-                        """,
-                        (new_stage, new_correct, timestamp, student_id, word_id),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        UPDATE word_mastery
-                        SET mastery_stage = %s, correct_count = %s, last_practiced_at = %s
-                        WHERE student_id = %s AND word_id = %s;
-                        """,
-                        (new_stage, new_correct, timestamp, student_id, word_id),
-                    )
-            else:
-                if _backend == "sqlite":
-                    cur.execute(
-                        """
-                        INSERT INTO word_mastery (
-                            student_id,
-                            word_id,
-                            mastery_stage,
-                            correct_count,
-                            last_practiced_at
-                        ) VALUES (?, ?, ?, ?, ?);
-                        """,
-                        (student_id, word_id, new_stage, new_correct, timestamp),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        INSERT INTO word_mastery (
-                            student_id,
-                            word_id,
-                            mastery_stage,
-                            correct_count,
-                            last_practiced_at
-                        ) VALUES (%s, %s, %s, %s, %s);
-                        """,
-                        (student_id, word_id, new_stage, new_correct, timestamp),
-                    )
-
-            if is_new_mastered:
-                mastered_gained += 1
-            updated_ids.append(word_id)
-
+    with db_cursor() as (conn, cur):
+        summary = _apply_word_mastery_results(cur, student_id, results, timestamp)
         conn.commit()
-    finally:
-        cur.close()
 
-    return {"mastered_gained": mastered_gained, "updated_ids": updated_ids}
+    return summary
 
 
-def update_student_progress_for_quiz(
-    *,
+def _apply_quiz_progress(
+    cur,
     student_id: int,
     correct: int,
     total: int,
-    attempted_at: Optional[datetime.datetime] = None,
+    timestamp: datetime.datetime,
 ) -> dict[str, object]:
-    """Apply XP, streak, and last quiz updates for a completed quiz."""
-    ensure_student_progress_row(student_id)
-
-    timestamp = attempted_at or datetime.datetime.utcnow()
-    conn = get_connection()
-    cur = conn.cursor()
-
-    select_query = """
-        SELECT xp, streak_count, last_quiz_at
-        FROM student_progress
-        WHERE student_id = %s;
-    """
-    if _backend == "sqlite":
-        select_query = select_query.replace("%s", "?")
-
-    cur.execute(select_query, (student_id,))
+    cur.execute(_SQL["student_progress_for_update"], (student_id,))
     row = cur.fetchone()
     if row is not None and _backend == "sqlite":
         row = dict(row)
@@ -2550,8 +2077,6 @@ def update_student_progress_for_quiz(
             """,
             (xp_updated, new_streak, timestamp, student_id),
         )
-    conn.commit()
-    cur.close()
 
     return {
         "xp": xp_updated,
@@ -2563,30 +2088,64 @@ def update_student_progress_for_quiz(
     }
 
 
+@_invalidates_request_cache
+def update_student_progress_for_quiz(
+    *,
+    student_id: int,
+    correct: int,
+    total: int,
+    attempted_at: Optional[datetime.datetime] = None,
+) -> dict[str, object]:
+    """Apply XP, streak, and last quiz updates for a completed quiz."""
+    timestamp = attempted_at or datetime.datetime.utcnow()
+    with db_cursor() as (conn, cur):
+        progress = _apply_quiz_progress(cur, student_id, correct, total, timestamp)
+        conn.commit()
+
+    return progress
+
+
+@_invalidates_request_cache
+def persist_quiz_result(
+    *,
+    student_id: int,
+    attempts: Sequence[dict[str, object]],
+    mastery: Sequence[dict[str, object]],
+    correct: int,
+    total: int,
+    attempted_at: Optional[datetime.datetime] = None,
+) -> dict[str, object]:
+    """Record attempts, mastery, and progress for a quiz in one transaction.
+
+    The result also carries the student's ``mastered_total`` after the update.
+    """
+    timestamp = attempted_at or datetime.datetime.utcnow()
+    with db_cursor() as (conn, cur):
+        _insert_quiz_attempts(cur, student_id, attempts, timestamp)
+        mastery_summary = _apply_word_mastery_results(cur, student_id, mastery, timestamp)
+        progress = _apply_quiz_progress(cur, student_id, correct, total, timestamp)
+        cur.execute(_SQL["count_mastered_words"], (student_id,))
+        row = cur.fetchone()
+        conn.commit()
+
+    return {
+        "progress": progress,
+        "mastery": mastery_summary,
+        "mastered_total": int(row["total"]) if row else 0,
+    }
+
+
 def count_mastered_words(student_id: int) -> int:
     """Return the number of mastered words for a student."""
-    conn = get_connection()
-    cur = conn.cursor()
-    query = """
-        SELECT COUNT(*) AS total
-        FROM word_mastery
-        WHERE student_id = %s
-          AND mastery_stage = 'mastered';
-    """
-    if _backend == "sqlite":
-        query = query.replace("%s", "?")
-    try:
-        cur.execute(query, (student_id,))
+    with db_cursor() as (conn, cur):
+        cur.execute(_SQL["count_mastered_words"], (student_id,))
         row = cur.fetchone()
         if row is None:
             return 0
-        if _backend == "sqlite":
-            return int(row["total"])
         return int(row["total"])
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def award_badges_if_needed(student_id: int, mastered_total: int) -> list[str]:
     """Award milestone badges if thresholds have been reached."""
     thresholds = [
@@ -2594,43 +2153,32 @@ def award_badges_if_needed(student_id: int, mastered_total: int) -> list[str]:
         (50, "50_words"),
         (100, "100_words"),
     ]
-    existing = {
-        str(badge.get("badge_type"))
-        for badge in list_badges_for_student(student_id)
-    }
-
-    earned: list[str] = []
-    if mastered_total <= 0:
-        return earned
+    candidates = [
+        badge_type for threshold, badge_type in thresholds if mastered_total >= threshold
+    ]
+    if not candidates:
+        return []
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        for threshold, badge_type in thresholds:
-            if mastered_total >= threshold and badge_type not in existing:
-                if _backend == "sqlite":
-                    cur.execute(
-                        """
-                        INSERT INTO badges (student_id, badge_type)
-                        VALUES (?, ?);
-                        """,
-                        (student_id, badge_type),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        INSERT INTO badges (student_id, badge_type)
-                        VALUES (%s, %s);
-                        """,
-                        (student_id, badge_type),
-                    )
-                earned.append(badge_type)
-        if earned:
+    # The unique (student_id, badge_type) index makes re-awarding a no-op, so
+    # RETURNING yields exactly the badges that are new.
+    with db_cursor() as (conn, cur):
+        cur.execute(
+            """
+            INSERT INTO badges (student_id, badge_type)
+            SELECT %s, badge_type
+            FROM unnest(%s::varchar[]) AS candidate(badge_type)
+            ON CONFLICT (student_id, badge_type) DO NOTHING
+            RETURNING badge_type;
+            """,
+            (student_id, candidates),
+        )
+        inserted = {str(row["badge_type"]) for row in cur.fetchall() or []}
+        if inserted:
             conn.commit()
-    finally:
-        cur.close()
+    if inserted:
+        _badge_cache.pop(student_id)
 
-    return earned
+    return [badge_type for badge_type in candidates if badge_type in inserted]
 
 
 def compute_level(xp: int) -> int:
@@ -2640,6 +2188,90 @@ def compute_level(xp: int) -> int:
     return xp // 500
 
 
+# Optional educator review filters, in the order of the values built by
+# _educator_recommendations_where().
+_EDUCATOR_RECOMMENDATION_FILTERS = (
+    "r.student_id = %s",
+    "r.difficulty_score >= %s",
+    "r.difficulty_score <= %s",
+    "r.created_at >= %s",
+    "r.created_at <= %s",
+    "r.status = %s",
+)
+
+_EDUCATOR_RECOMMENDATIONS_SQL = """
+    SELECT
+        r.id,
+        r.student_id,
+        u.name AS student_name,
+        r.word,
+        r.definition,
+        r.rationale,
+        r.difficulty_score,
+        r.example_sentence,
+        r.status,
+        r.pinned,
+        r.created_at
+    FROM recommendations r
+    JOIN student_profiles sp ON sp.student_id = r.student_id
+    JOIN users u ON u.id = r.student_id
+    WHERE {where}
+    ORDER BY r.created_at DESC, r.id DESC
+    LIMIT %s OFFSET %s;
+"""
+
+_COUNT_EDUCATOR_RECOMMENDATIONS_SQL = """
+    SELECT COUNT(*) AS total
+    FROM recommendations r
+    JOIN student_profiles sp ON sp.student_id = r.student_id
+    WHERE {where};
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class EducatorRecommendationRow:
+    """One recommendation in an educator's review list."""
+
+    id: int
+    student_id: int
+    student_name: Optional[str]
+    word: str
+    definition: str
+    rationale: str
+    difficulty_score: int
+    example_sentence: str
+    status: str
+    pinned: bool
+    created_at: datetime.datetime
+
+    def to_dict(self) -> dict[str, object]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _educator_recommendations_where(
+    educator_id: int,
+    student_id: Optional[int],
+    difficulty_min: Optional[int],
+    difficulty_max: Optional[int],
+    date_from: Optional[datetime.datetime],
+    date_to: Optional[datetime.datetime],
+    status: Optional[str],
+) -> tuple[str, tuple[object, ...]]:
+    """Return the WHERE clause and parameters for the filters actually supplied.
+
+    Absent filters are left out instead of being passed as NULL, so every
+    combination is planned against the indexes it can use.
+    """
+    values = (student_id, difficulty_min, difficulty_max, date_from, date_to, status or None)
+    clauses = ["sp.educator_id = %s"]
+    params: list[object] = [educator_id]
+    for predicate, value in zip(_EDUCATOR_RECOMMENDATION_FILTERS, values):
+        if value is not None:
+            clauses.append(predicate)
+            params.append(value)
+    return " AND ".join(clauses), tuple(params)
+
+
 def list_recommendations_for_educator_filtered(
     *,
     educator_id: int,
@@ -2651,89 +2283,18 @@ def list_recommendations_for_educator_filtered(
     status: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
-) -> list[dict[str, object]]:
+) -> list[EducatorRecommendationRow]:
     """Return educator-scoped recommendations with optional filters."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        conditions = ["sp.educator_id = %s"]
-        params: list[object] = [educator_id]
-
-        if student_id is not None:
-            conditions.append("r.student_id = %s")
-            params.append(student_id)
-
-        if difficulty_min is not None:
-            conditions.append("r.difficulty_score >= %s")
-            params.append(difficulty_min)
-
-        if difficulty_max is not None:
-            conditions.append("r.difficulty_score <= %s")
-            params.append(difficulty_max)
-
-        if date_from is not None:
-            conditions.append("r.created_at >= %s")
-            params.append(date_from)
-
-        if date_to is not None:
-            conditions.append("r.created_at <= %s")
-            params.append(date_to)
-
-        if status:
-            conditions.append("r.status = %s")
-            params.append(status)
-
-        where_clause = " AND ".join(conditions)
-
-        query = f"""
-            SELECT
-                r.id,
-                r.student_id,
-                u.name AS student_name,
-                r.word,
-                r.definition,
-                r.rationale,
-                r.difficulty_score,
-                r.example_sentence,
-                r.status,
-                r.pinned,
-                r.created_at
-            FROM recommendations r
-            JOIN student_profiles sp ON sp.student_id = r.student_id
-            JOIN users u ON u.id = r.student_id
-            WHERE {where_clause}
-            ORDER BY r.created_at DESC, r.id DESC
-            LIMIT %s OFFSET %s;
-        """
-        params.extend([limit, offset])
-
-        if _backend == "sqlite":
-            query = query.replace("%s", "?")
-        cur.execute(query, tuple(params))
-        rows = cur.fetchall() or []
-        if _backend == "sqlite":
-            rows = [dict(row) for row in rows]
-        normalized: list[dict[str, object]] = []
-        for row in rows:
-            pinned_value = row.get("pinned")
-            normalized.append(
-                {
-                    "id": row["id"],
-                    "student_id": row["student_id"],
-                    "student_name": row.get("student_name"),
-                    "word": row["word"],
-                    "definition": row["definition"],
-                    "rationale": row["rationale"],
-                    "difficulty_score": row["difficulty_score"],
-                    "example_sentence": row["example_sentence"],
-                    "status": row["status"],
-                    "pinned": bool(pinned_value),
-                    "created_at": row["created_at"],
-                }
-            )
-        return normalized
-    finally:
-        cur.close()
+    where, params = _educator_recommendations_where(
+        educator_id, student_id, difficulty_min, difficulty_max, date_from, date_to, status
+    )
+    with db_cursor() as (conn, cur):
+        # Columns map positionally onto EducatorRecommendationRow.
+        cur.row_factory = tuple_row
+        cur.execute(
+            _EDUCATOR_RECOMMENDATIONS_SQL.format(where=where), (*params, limit, offset)
+        )
+        return [EducatorRecommendationRow(*row) for row in cur.fetchall() or []]
 
 
 def count_recommendations_for_educator_filtered(
@@ -2747,57 +2308,18 @@ def count_recommendations_for_educator_filtered(
     status: Optional[str] = None,
 ) -> int:
     """Return count of recommendations for educator given filters."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        conditions = ["sp.educator_id = %s"]
-        params: list[object] = [educator_id]
-
-        if student_id is not None:
-            conditions.append("r.student_id = %s")
-            params.append(student_id)
-
-        if difficulty_min is not None:
-            conditions.append("r.difficulty_score >= %s")
-            params.append(difficulty_min)
-
-        if difficulty_max is not None:
-            conditions.append("r.difficulty_score <= %s")
-            params.append(difficulty_max)
-
-        if date_from is not None:
-            conditions.append("r.created_at >= %s")
-            params.append(date_from)
-
-        if date_to is not None:
-            conditions.append("r.created_at <= %s")
-            params.append(date_to)
-
-        if status:
-            conditions.append("r.status = %s")
-            params.append(status)
-
-        where_clause = " AND ".join(conditions)
-        query = f"""
-            SELECT COUNT(*) AS total
-            FROM recommendations r
-            JOIN student_profiles sp ON sp.student_id = r.student_id
-            WHERE {where_clause};
-        """
-
-        if _backend == "sqlite":
-            query = query.replace("%s", "?")
-        cur.execute(query, tuple(params))
+    where, params = _educator_recommendations_where(
+        educator_id, student_id, difficulty_min, difficulty_max, date_from, date_to, status
+    )
+    with db_cursor() as (conn, cur):
+        cur.execute(_COUNT_EDUCATOR_RECOMMENDATIONS_SQL.format(where=where), params)
         row = cur.fetchone()
-        if _backend == "sqlite" and row is not None:
-            return int(row["total"])
         if row is None:
             return 0
         return int(row["total"])
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def update_recommendations_status_scoped(
     *,
     educator_id: int,
@@ -2808,31 +2330,26 @@ def update_recommendations_status_scoped(
     if not ids:
         return 0
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        placeholders = ", ".join(["%s"] * len(ids))
-        query = f"""
+    with db_cursor() as (conn, cur):
+        cur.execute(
+            """
             UPDATE recommendations
             SET status = %s
-            WHERE id IN ({placeholders})
+            WHERE id = ANY(%s::int[])
               AND student_id IN (
                   SELECT sp.student_id
                   FROM student_profiles sp
                   WHERE sp.educator_id = %s
               );
-        """
-        params = [status, *ids, educator_id]
-        if _backend == "sqlite":
-            query = query.replace("%s", "?")
-        cur.execute(query, tuple(params))
+            """,
+            (status, list(ids), educator_id),
+        )
         affected = cur.rowcount or 0
         conn.commit()
         return int(affected)
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def update_recommendation_rationale_scoped(
     *,
     educator_id: int,
@@ -2840,9 +2357,7 @@ def update_recommendation_rationale_scoped(
     rationale: str,
 ) -> bool:
     """Update rationale if recommendation belongs to educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         query = """
             UPDATE recommendations
             SET rationale = %s
@@ -2860,10 +2375,9 @@ def update_recommendation_rationale_scoped(
         affected = cur.rowcount or 0
         conn.commit()
         return affected > 0
-    finally:
-        cur.close()
 
 
+@_invalidates_request_cache
 def update_recommendation_pinned_scoped(
     *,
     educator_id: int,
@@ -2871,9 +2385,7 @@ def update_recommendation_pinned_scoped(
     pinned: bool,
 ) -> bool:
     """Toggle pinned flag scoped to educator."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with db_cursor() as (conn, cur):
         pinned_value = 1 if pinned else 0
         if _backend != "sqlite":
             pinned_value = bool(pinned)
@@ -2894,17 +2406,17 @@ def update_recommendation_pinned_scoped(
         affected = cur.rowcount or 0
         conn.commit()
         return affected > 0
-    finally:
-        cur.close()
 
 
 def get_baseline_words_for_grade(
     grade_level: int, limit: int = 200
 ) -> list[dict[str, object]]:
     """Fetch baseline words for a grade level."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    key = (grade_level, limit)
+    cached = _baseline_words_cache.get(key)
+    if cached is not None:
+        return [dict(row) for row in cached]
+    with db_cursor() as (conn, cur):
         if _backend == "sqlite":
             cur.execute(
                 """
@@ -2916,20 +2428,17 @@ def get_baseline_words_for_grade(
                 """,
                 (grade_level, limit),
             )
-            rows = cur.fetchall() or []
-            return [dict(row) for row in rows]
-        cur.execute(
-            """
-            SELECT word, definition, difficulty
-            FROM baseline_words
-            WHERE grade_level = %s
-            ORDER BY difficulty ASC, word ASC
-            LIMIT %s;
-            """,
-            (grade_level, limit),
-        )
-        rows = cur.fetchall() or []
-        return rows
-    finally:
-        cur.close()
-
+        else:
+            cur.execute(
+                """
+                SELECT word, definition, difficulty
+                FROM baseline_words
+                WHERE grade_level = %s
+                ORDER BY difficulty ASC, word ASC
+                LIMIT %s;
+                """,
+                (grade_level, limit),
+            )
+        rows = [dict(row) for row in cur.fetchall() or []]
+    _baseline_words_cache.set(key, tuple(rows))
+    return [dict(row) for row in rows]
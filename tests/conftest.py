@@ -1,12 +1,39 @@
 import os
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from typing import Optional
 
 import pytest
 
 from app import create_app
+from config.settings import get_settings
 from models import reset_engine
 
 
+@pytest.fixture(autouse=True)
+def _fresh_settings() -> Iterator[None]:
+    """Start and finish every test with freshly loaded settings."""
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture()
+def set_env(monkeypatch: pytest.MonkeyPatch) -> Callable[[str, Optional[str]], None]:
+    """Set (or, given ``None``, unset) an environment variable mid-test.
+
+    The memoized settings are dropped so the next get_settings() sees the change.
+    """
+
+    def _set_env(name: str, value: Optional[str]) -> None:
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+        get_settings.cache_clear()
+
+    return _set_env
+
+
 @pytest.fixture()
 def app(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("SECRET_KEY", "test-secret")
@@ -3,8 +3,8 @@ from __future__ import annotations
 from app.services import content_filter
 
 
-def test_filter_recommendations_removes_profanity(monkeypatch):
-    monkeypatch.setenv("CONTENT_FILTER_ENABLED", "true")
+def test_filter_recommendations_removes_profanity(set_env):
+    set_env("CONTENT_FILTER_ENABLED", "true")
     safe = {
         "word": "analyze",
         "definition": "Examine something carefully to understand it better.",
@@ -25,8 +25,8 @@ def test_filter_recommendations_removes_profanity(monkeypatch):
     assert filtered[0]["word"] == "analyze"
 
 
-def test_filter_normalizes_difficulty_and_defaults(monkeypatch):
-    monkeypatch.setenv("CONTENT_FILTER_ENABLED", "false")
+def test_filter_normalizes_difficulty_and_defaults(set_env):
+    set_env("CONTENT_FILTER_ENABLED", "false")
 
     record = {
         "word": "Synthesize",
@@ -43,12 +43,12 @@ def test_filter_normalizes_difficulty_and_defaults(monkeypatch):
     assert filtered[0]["pinned"] is True
 
 
-def test_filter_uses_extra_sensitive_wordlist(monkeypatch, tmp_path):
+def test_filter_uses_extra_sensitive_wordlist(monkeypatch, tmp_path, set_env):
     extra_terms = tmp_path / "sensitive.txt"
     extra_terms.write_text("forbidden\n", encoding="utf-8")
 
-    monkeypatch.setenv("CONTENT_FILTER_ENABLED", "true")
-    monkeypatch.setenv("CONTENT_FILTER_EXTRA_WORDS_PATH", str(extra_terms))
+    set_env("CONTENT_FILTER_ENABLED", "true")
+    set_env("CONTENT_FILTER_EXTRA_WORDS_PATH", str(extra_terms))
     monkeypatch.setattr(content_filter, "_PROFANITY_INITIALIZED", False)
     monkeypatch.setattr(content_filter, "_EXTRA_WORDS_LOADED", False)
 
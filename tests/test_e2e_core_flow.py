@@ -33,7 +33,7 @@ class _FakeS3Client:
     def __init__(self):
         self.files: dict[str, bytes] = {}
 
-    def upload_fileobj(self, fileobj, bucket: str, key: str) -> None:
+    def upload_fileobj(self, fileobj, bucket: str, key: str, Config=None) -> None:
         fileobj.seek(0)
         self.files[f"{bucket}/{key}"] = fileobj.read()
         fileobj.seek(0)
@@ -45,7 +45,7 @@ class _FakeS3Client:
 
 
 @pytest.fixture()
-def fake_s3_client(monkeypatch):
+def fake_s3_client(monkeypatch, set_env):
     """Provide a fake S3 client for testing."""
     fake = _FakeS3Client()
 
@@ -55,12 +55,12 @@ def fake_s3_client(monkeypatch):
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
     return fake
 
 
 @pytest.fixture()
-def mock_openai(monkeypatch):
+def mock_openai(monkeypatch, set_env):
     """Mock OpenAI client to return predictable recommendations."""
     mock_recommendations = {
         "recommendations": [
@@ -109,7 +109,7 @@ def mock_openai(monkeypatch):
         "app.services.openai_client.generate_json_response",
         mock_generate_json_response,
     )
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    set_env("OPENAI_API_KEY", "test-key")
 
 
 @pytest.mark.e2e
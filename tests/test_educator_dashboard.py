@@ -6,11 +6,14 @@ import pytest
 
 from app.security import hash_password
 from models import (
+    begin_request_cache,
     create_recommendations,
     create_student_profile,
     create_upload_record,
     create_user,
+    end_request_cache,
     get_connection,
+    get_student_overview,
 )
 
 
@@ -254,3 +257,17 @@ def test_student_detail_requires_ownership(client, educator_with_students):
     forbidden_response = client.get(f"/educator/students/{other_student.id}")
     assert forbidden_response.status_code == 404
 
+
+def test_request_cache_accepts_keywords_and_returns_copies(educator_with_students):
+    educator, student_one, _ = educator_with_students
+
+    begin_request_cache()
+    try:
+        by_position = get_student_overview(educator.id, student_one.id)
+        by_keyword = get_student_overview(educator_id=educator.id, student_id=student_one.id)
+        assert by_position == by_keyword
+
+        by_position["name"] = "Changed"
+        assert get_student_overview(educator.id, student_one.id)["name"] == "Student One"
+    finally:
+        end_request_cache()
@@ -21,7 +21,7 @@ class _FakeS3Client:
     def __init__(self):
         self.files: dict[str, bytes] = {}
 
-    def upload_fileobj(self, fileobj, bucket: str, key: str) -> None:
+    def upload_fileobj(self, fileobj, bucket: str, key: str, Config=None) -> None:
         fileobj.seek(0)
         self.files[f"{bucket}/{key}"] = fileobj.read()
         fileobj.seek(0)
@@ -33,7 +33,7 @@ class _FakeS3Client:
 
 
 @pytest.fixture()
-def fake_s3_client(monkeypatch):
+def fake_s3_client(monkeypatch, set_env):
     fake = _FakeS3Client()
 
     def fake_boto_client(service_name: str, **kwargs):
@@ -42,7 +42,7 @@ def fake_s3_client(monkeypatch):
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
     return fake
 
 
@@ -81,7 +81,7 @@ def _login_as_educator(client, username: str, password: str) -> None:
 
 
 @pytest.mark.error
-def test_upload_rejects_no_files(client, monkeypatch, educator_and_student):
+def test_upload_rejects_no_files(client, monkeypatch, educator_and_student, set_env):
     """Verify upload API rejects requests with no files."""
     educator, student = educator_and_student
     _login_as_educator(client, educator.username, "TeacherPass123!")
@@ -94,7 +94,7 @@ def test_upload_rejects_no_files(client, monkeypatch, educator_and_student):
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
 
     response = client.post("/api/upload", data={"student_id": str(student.id)})
     assert response.status_code == 400
@@ -104,7 +104,7 @@ def test_upload_rejects_no_files(client, monkeypatch, educator_and_student):
 
 
 @pytest.mark.error
-def test_upload_rejects_unsupported_file_type(client, monkeypatch, educator_and_student):
+def test_upload_rejects_unsupported_file_type(client, monkeypatch, educator_and_student, set_env):
     """Verify upload API rejects unsupported file types."""
     educator, student = educator_and_student
     _login_as_educator(client, educator.username, "TeacherPass123!")
@@ -117,7 +117,7 @@ def test_upload_rejects_unsupported_file_type(client, monkeypatch, educator_and_
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
 
     data = {
         "student_id": str(student.id),
@@ -133,7 +133,7 @@ def test_upload_rejects_unsupported_file_type(client, monkeypatch, educator_and_
 
 
 @pytest.mark.error
-def test_upload_rejects_oversized_file(client, monkeypatch, educator_and_student):
+def test_upload_rejects_oversized_file(client, monkeypatch, educator_and_student, set_env):
     """Verify upload API rejects files exceeding size limit."""
     educator, student = educator_and_student
     _login_as_educator(client, educator.username, "TeacherPass123!")
@@ -146,7 +146,7 @@ def test_upload_rejects_oversized_file(client, monkeypatch, educator_and_student
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
 
     # Create a file that exceeds 10MB
     oversized_content = b"x" * (11 * 1024 * 1024)  # 11MB
@@ -164,12 +164,12 @@ def test_upload_rejects_oversized_file(client, monkeypatch, educator_and_student
 
 
 @pytest.mark.error
-def test_upload_fails_when_s3_not_configured(client, monkeypatch, educator_and_student):
+def test_upload_fails_when_s3_not_configured(client, educator_and_student, set_env):
     """Verify upload returns error when S3 bucket is not configured."""
     educator, student = educator_and_student
     _login_as_educator(client, educator.username, "TeacherPass123!")
 
-    monkeypatch.delenv("AWS_S3_BUCKET_NAME", raising=False)
+    set_env("AWS_S3_BUCKET_NAME", None)
 
     data = {
         "student_id": str(student.id),
@@ -183,7 +183,7 @@ def test_upload_fails_when_s3_not_configured(client, monkeypatch, educator_and_s
 
 
 @pytest.mark.error
-def test_ai_processing_handles_openai_failure(monkeypatch, app_context, fake_s3_client):
+def test_ai_processing_handles_openai_failure(monkeypatch, app_context, fake_s3_client, set_env):
     """Verify worker handles OpenAI API failures gracefully."""
     educator = create_user(
         name="AI Error Educator",
@@ -229,8 +229,8 @@ def test_ai_processing_handles_openai_failure(monkeypatch, app_context, fake_s3_
         "app.services.openai_client.generate_json_response",
         mock_openai_error,
     )
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
-    monkeypatch.setenv("AI_MAX_RETRIES", "2")  # Reduce retries for faster test
+    set_env("OPENAI_API_KEY", "test-key")
+    set_env("AI_MAX_RETRIES", "2")  # Reduce retries for faster test
 
     # Process job - should fail after retries
     result = process_upload_job(upload_id, s3_client=fake_s3_client)
@@ -244,7 +244,7 @@ def test_ai_processing_handles_openai_failure(monkeypatch, app_context, fake_s3_
 
 
 @pytest.mark.error
-def test_ai_processing_rejects_insufficient_words(monkeypatch, app_context, fake_s3_client):
+def test_ai_processing_rejects_insufficient_words(monkeypatch, app_context, fake_s3_client, set_env):
     """Verify worker rejects uploads with insufficient word count."""
     educator = create_user(
         name="Word Count Educator",
@@ -290,7 +290,7 @@ def test_ai_processing_rejects_insufficient_words(monkeypatch, app_context, fake
         "app.services.openai_client.generate_json_response",
         mock_openai_success,
     )
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    set_env("OPENAI_API_KEY", "test-key")
 
     # Process job - should fail due to insufficient words
     result = process_upload_job(upload_id, s3_client=fake_s3_client)
@@ -6,6 +6,7 @@ import uuid
 from app.security import hash_password
 from app.services.quizzes import score_quiz_and_update
 from models import (
+    award_badges_if_needed,
     count_mastered_words,
     create_recommendations,
     create_student_profile,
@@ -14,6 +15,9 @@ from models import (
     ensure_student_progress_row,
     get_connection,
     list_approved_words_for_student,
+    list_badges_for_student,
+    list_word_mastery_for_student,
+    update_word_mastery_from_results,
 )
 
 
@@ -132,3 +136,59 @@ def test_streak_progression_and_badge_awards(app_context):
         cur.close()
 
     assert attempts_count == len(answers_all_correct) * len(attempt_windows)
+
+
+def test_award_badges_only_awards_each_badge_once(app_context):
+    student = _create_student_with_words(1)
+
+    assert award_badges_if_needed(student.id, 9) == []
+    assert award_badges_if_needed(student.id, 55) == ["10_words", "50_words"]
+    assert award_badges_if_needed(student.id, 55) == []
+    assert award_badges_if_needed(student.id, 100) == ["100_words"]
+
+    badge_types = sorted(badge["badge_type"] for badge in list_badges_for_student(student.id))
+    assert badge_types == ["100_words", "10_words", "50_words"]
+
+
+def _mastery_by_word(student_id: int) -> dict[int, dict[str, object]]:
+    return {row["word_id"]: row for row in list_word_mastery_for_student(student_id)}
+
+
+def test_word_mastery_caps_counts_and_counts_mastery_once(app_context):
+    student = _create_student_with_words(2)
+    first_id, second_id = (entry["id"] for entry in list_approved_words_for_student(student.id))
+
+    # A word without a mastery row gets one.
+    summary = update_word_mastery_from_results(
+        student_id=student.id, results=[{"word_id": first_id, "increment": 1}]
+    )
+    assert summary == {"mastered_gained": 0, "updated_ids": [first_id]}
+    row = _mastery_by_word(student.id)[first_id]
+    assert row["correct_count"] == 1
+    assert row["mastery_stage"] == "practicing"
+
+    # The count is capped at 3 and the move to mastered is counted once.
+    summary = update_word_mastery_from_results(
+        student_id=student.id, results=[{"word_id": first_id, "increment": 5}]
+    )
+    assert summary["mastered_gained"] == 1
+    row = _mastery_by_word(student.id)[first_id]
+    assert row["correct_count"] == 3
+    assert row["mastery_stage"] == "mastered"
+
+    # Practicing an already mastered word gains nothing.
+    summary = update_word_mastery_from_results(
+        student_id=student.id, results=[{"word_id": first_id, "increment": 1}]
+    )
+    assert summary["mastered_gained"] == 0
+    assert _mastery_by_word(student.id)[first_id]["correct_count"] == 3
+
+    # Repeated word_ids in one batch are summed into a single update.
+    summary = update_word_mastery_from_results(
+        student_id=student.id,
+        results=[{"word_id": second_id, "increment": 1}] * 4,
+    )
+    assert summary == {"mastered_gained": 1, "updated_ids": [second_id] * 4}
+    row = _mastery_by_word(student.id)[second_id]
+    assert row["correct_count"] == 3
+    assert row["mastery_stage"] == "mastered"
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+
+def test_json_responses_match_flask_default_format(app, app_context):
+    payload = {
+        "zeta": 1,
+        "alpha": datetime.datetime(2024, 1, 5, 15, 0, 0),
+        "day": datetime.date(2024, 1, 6),
+    }
+
+    response = app.json.response(payload)
+
+    assert response.get_data(as_text=True).strip() == (
+        '{"alpha":"Fri, 05 Jan 2024 15:00:00 GMT",'
+        '"day":"Sat, 06 Jan 2024 00:00:00 GMT",'
+        '"zeta":1}'
+    )
+
+
+def test_json_loads_honours_decoder_options(app):
+    assert app.json.loads('{"score": 1.5}') == {"score": 1.5}
+    assert app.json.loads('{"score": 1.5}', parse_float=Decimal) == {"score": Decimal("1.5")}
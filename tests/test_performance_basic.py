@@ -74,7 +74,7 @@ def test_concurrent_index_requests(app):
 
 
 @pytest.mark.perf
-def test_worker_processing_time(monkeypatch, app_context):
+def test_worker_processing_time(monkeypatch, app_context, set_env):
     """Verify worker processes uploads within reasonable time bounds."""
     from app.jobs.worker import process_upload_job
     from models import create_user, create_student_profile, create_upload_record
@@ -101,7 +101,7 @@ def test_worker_processing_time(monkeypatch, app_context):
         raise AssertionError(f"Unsupported service: {service_name}")
 
     monkeypatch.setattr("boto3.client", fake_boto_client)
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
 
     # Mock OpenAI to return quickly with 5 recommendations (using safe words that pass content filter)
     def mock_openai(*args, **kwargs):
@@ -149,7 +149,7 @@ def test_worker_processing_time(monkeypatch, app_context):
         "app.services.openai_client.generate_json_response",
         mock_openai,
     )
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    set_env("OPENAI_API_KEY", "test-key")
 
     # Create test data
     educator = create_user(
@@ -30,3 +30,28 @@ def test_contains_pii_detects_common_patterns():
     assert pii.contains_pii("This essay is by Jane Doe")
     assert not pii.contains_pii("There is nothing sensitive here.")
 
+
+def test_scrub_pii_overlapping_matches_keep_sequential_results():
+    # Emails are scrubbed before phones, so digits inside an address never
+    # surface as a separate phone match.
+    assert pii.scrub_pii("Email 5551234567@school.org now") == "Email [REDACTED_EMAIL] now"
+    assert (
+        pii.scrub_pii("Reach Jane Doe at jane.doe@example.com or 555-123-4567.")
+        == "[REDACTED_NAME] at [REDACTED_EMAIL] or [REDACTED_PHONE]."
+    )
+    assert (
+        pii.scrub_pii("Parent: Mary Ann Lee called 1-800-555-0199")
+        == "[REDACTED_NAME] called [REDACTED_PHONE]"
+    )
+    assert pii.scrub_pii("Order 12345678901234 ref") == "Order [REDACTED_PHONE]234 ref"
+
+
+def test_contains_pii_matches_overlapping_inputs():
+    assert pii.contains_pii("Email 5551234567@school.org now")
+    assert pii.contains_pii("Order 12345678901234 ref")
+
+
+def test_full_name_regex_captures_the_name():
+    match = pii.FULL_NAME_REGEX.search("written by Mary Ann Lee today")
+    assert match is not None
+    assert match.group(1) == "Mary Ann Lee"
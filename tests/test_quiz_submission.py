@@ -1,15 +1,25 @@
 from __future__ import annotations
+import datetime
 import uuid
 
+import pytest
+
+import models
 from app.security import hash_password
 from models import (
     create_recommendations,
     create_student_profile,
     create_upload_record,
+    count_mastered_words,
     create_user,
     ensure_student_progress_row,
     get_connection,
     list_approved_words_for_student,
+    list_word_mastery_for_student,
+    persist_quiz_result,
+    record_quiz_attempts,
+    update_student_progress_for_quiz,
+    update_word_mastery_from_results,
 )
 
 
@@ -159,3 +169,131 @@ def test_quiz_submission_updates_progress_and_records(client, app_context):
     assert attempts_count == len(answers)
     assert correct_count_first == 1
     assert correct_count_last == 0
+
+
+def test_record_quiz_attempts_skips_entries_without_valid_word_id(app_context):
+    setup = _create_student_with_words(word_count=1)
+    student = setup["student"]
+    word_id = list_approved_words_for_student(student.id)[0]["id"]
+
+    record_quiz_attempts(
+        student_id=student.id,
+        attempts=[
+            {"word_id": word_id, "correct": True},
+            {"word_id": None, "correct": True},
+            {"word_id": "abc", "correct": False},
+            {"correct": True},
+            {"word_id": str(word_id), "correct": False},
+        ],
+    )
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT word_id, correct FROM quiz_attempts WHERE student_id = %s ORDER BY id",
+            (student.id,),
+        )
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    assert [(row["word_id"], row["correct"]) for row in rows] == [
+        (word_id, True),
+        (word_id, False),
+    ]
+
+
+def _quiz_payloads(student_id: int) -> tuple[list[dict[str, object]], list[dict[str, object]]]:
+    words = list_approved_words_for_student(student_id)
+    attempts = [
+        {"word_id": entry["id"], "correct": index < 4} for index, entry in enumerate(words)
+    ]
+    mastery = [
+        {"word_id": entry["id"], "increment": 3 if index < 2 else int(index < 4)}
+        for index, entry in enumerate(words)
+    ]
+    return attempts, mastery
+
+
+def _count_rows(table: str, student_id: int) -> int:
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            f"SELECT COUNT(*) AS total FROM {table} WHERE student_id = %s", (student_id,)
+        )
+        return cur.fetchone()["total"]
+    finally:
+        cur.close()
+
+
+def test_persist_quiz_result_matches_separate_updates(app_context):
+    attempted_at = datetime.datetime(2024, 2, 1, 10, 0, 0)
+    combined_student = _create_student_with_words()["student"]
+    separate_student = _create_student_with_words()["student"]
+
+    attempts, mastery = _quiz_payloads(combined_student.id)
+    combined = persist_quiz_result(
+        student_id=combined_student.id,
+        attempts=attempts,
+        mastery=mastery,
+        correct=4,
+        total=len(attempts),
+        attempted_at=attempted_at,
+    )
+
+    attempts, mastery = _quiz_payloads(separate_student.id)
+    record_quiz_attempts(
+        student_id=separate_student.id, attempts=attempts, attempted_at=attempted_at
+    )
+    mastery_summary = update_word_mastery_from_results(
+        student_id=separate_student.id, results=mastery, attempted_at=attempted_at
+    )
+    progress = update_student_progress_for_quiz(
+        student_id=separate_student.id,
+        correct=4,
+        total=len(attempts),
+        attempted_at=attempted_at,
+    )
+
+    assert combined["progress"] == progress
+    assert combined["mastery"]["mastered_gained"] == mastery_summary["mastered_gained"] == 2
+    assert len(combined["mastery"]["updated_ids"]) == len(mastery_summary["updated_ids"])
+    assert combined["mastered_total"] == count_mastered_words(separate_student.id) == 2
+    assert _count_rows("quiz_attempts", combined_student.id) == len(attempts)
+
+
+def test_persist_quiz_result_rolls_back_when_a_step_fails(app_context, monkeypatch):
+    student = _create_student_with_words()["student"]
+    attempts, mastery = _quiz_payloads(student.id)
+
+    def fail_progress(*args, **kwargs):
+        raise RuntimeError("progress update failed")
+
+    monkeypatch.setattr(models, "_apply_quiz_progress", fail_progress)
+
+    with pytest.raises(RuntimeError):
+        persist_quiz_result(
+            student_id=student.id,
+            attempts=attempts,
+            mastery=mastery,
+            correct=4,
+            total=len(attempts),
+        )
+
+    assert _count_rows("quiz_attempts", student.id) == 0
+    assert list_word_mastery_for_student(student.id) == []
+    assert _count_rows("student_progress", student.id) == 1
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT xp, last_quiz_at FROM student_progress WHERE student_id = %s",
+            (student.id,),
+        )
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    assert row["xp"] == 0
+    assert row["last_quiz_at"] is None
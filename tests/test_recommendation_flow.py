@@ -49,7 +49,7 @@ def educator_and_student_ids(app_context):
 
 
 def test_process_upload_generates_recommendations(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, educator_and_student_ids
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, educator_and_student_ids, set_env
 ) -> None:
     educator_id, student_id = educator_and_student_ids
 
@@ -78,8 +78,8 @@ def test_process_upload_generates_recommendations(
         ]
     }
 
-    monkeypatch.setenv("CONTENT_FILTER_ENABLED", "true")
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    set_env("CONTENT_FILTER_ENABLED", "true")
+    set_env("OPENAI_API_KEY", "test-key")
 
     def fake_generate_json_response(messages, *, model: str, temperature: float):
         return json.dumps(fake_recommendations)
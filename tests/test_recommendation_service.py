@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+
+import pytest
+
+from app.services import openai_client, recommendations
+
+
+def _item(word: str) -> dict[str, object]:
+    return {
+        "word": word,
+        "definition": f"Definition of {word}.",
+        "rationale": f"Rationale for {word}.",
+        "difficulty_score": 4,
+        "example_sentence": f"Example using {word}.",
+    }
+
+
+def _request(grade: int, sample: str) -> dict[str, object]:
+    return {
+        "student_profile": {"grade_level": grade, "vocabulary_level": 600},
+        "writing_sample": sample,
+        "baseline_words": [],
+    }
+
+
+def test_parse_batch_returns_one_normalized_list_per_student():
+    payload = json.dumps(
+        {
+            "recommendations_1": [_item("analyze"), _item(" Analyze "), "not a dict", {"word": ""}],
+            "recommendations_2": [_item("interpret")],
+            "recommendations_3": [_item("ignored")],
+        }
+    )
+
+    results = recommendations.parse_batch_recommendations_from_json(payload, 2)
+
+    assert [[entry["word"] for entry in result] for result in results] == [
+        ["analyze"],
+        ["interpret"],
+    ]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"recommendations_1": [',
+        "",
+        json.dumps([_item("analyze")]),
+        json.dumps("recommendations"),
+    ],
+)
+def test_parse_batch_rejects_malformed_payloads(payload):
+    with pytest.raises(recommendations.RecommendationParseError):
+        recommendations.parse_batch_recommendations_from_json(payload, 2)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"recommendations_1": [_item("analyze")]},
+        {"recommendations_1": [_item("analyze")], "recommendations_2": None},
+        {"recommendations_1": [_item("analyze")], "recommendations_2": {"word": "interpret"}},
+    ],
+)
+def test_parse_batch_rejects_partial_payloads(payload):
+    with pytest.raises(recommendations.RecommendationParseError, match="student 2"):
+        recommendations.parse_batch_recommendations_from_json(json.dumps(payload), 2)
+
+
+def test_generate_batch_rejects_a_short_student_list(monkeypatch, set_env):
+    set_env("RECS_CACHE_ENABLED", "false")
+    payload = json.dumps(
+        {
+            "recommendations_1": [_item(f"first{index}") for index in range(5)],
+            "recommendations_2": [_item("second0")],
+        }
+    )
+    monkeypatch.setattr(
+        openai_client, "generate_json_response", lambda messages, *, model, temperature: payload
+    )
+
+    with pytest.raises(recommendations.RecommendationParseError, match="student 2"):
+        recommendations.generate_recommendations_batch(
+            [_request(6, "First sample."), _request(7, "Second sample.")]
+        )
+
+
+@pytest.fixture()
+def fake_openai(monkeypatch):
+    """Count OpenAI calls and answer each with five recommendations."""
+    monkeypatch.setattr(recommendations, "_RESPONSE_CACHE", OrderedDict())
+    calls: list[list[dict[str, str]]] = []
+
+    def fake_generate_json_response(messages, *, model, temperature):
+        calls.append(messages)
+        return json.dumps({"recommendations": [_item(f"word{index}") for index in range(5)]})
+
+    monkeypatch.setattr(openai_client, "generate_json_response", fake_generate_json_response)
+    return calls
+
+
+def test_response_cache_disabled_calls_openai_every_time(fake_openai, set_env):
+    set_env("RECS_CACHE_ENABLED", "false")
+
+    for _ in range(2):
+        recommendations.generate_recommendations(**_request(6, "Same sample."))
+
+    assert len(fake_openai) == 2
+    assert not recommendations._RESPONSE_CACHE
+
+
+def test_response_cache_hits_identical_prompts_only(fake_openai, set_env):
+    set_env("RECS_CACHE_ENABLED", "true")
+
+    first = recommendations.generate_recommendations(**_request(6, "Same sample."))
+    second = recommendations.generate_recommendations(**_request(6, "Same sample."))
+    assert len(fake_openai) == 1
+    assert second == first
+
+    recommendations.generate_recommendations(**_request(6, "Different sample."))
+    assert len(fake_openai) == 2
+    assert len(recommendations._RESPONSE_CACHE) == 2
+
+
+def test_response_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(recommendations, "_RESPONSE_CACHE", OrderedDict())
+    limit = recommendations.RESPONSE_CACHE_MAX_ENTRIES
+    assert limit == 100
+
+    for index in range(limit):
+        recommendations._store_response(f"key{index}", f"response{index}")
+    # Reading key0 makes key1 the least recently used entry.
+    assert recommendations._cached_response("key0") == "response0"
+    recommendations._store_response("overflow", "response")
+
+    assert len(recommendations._RESPONSE_CACHE) == limit
+    assert recommendations._cached_response("key1") is None
+    assert recommendations._cached_response("key0") == "response0"
+    assert recommendations._cached_response("overflow") == "response"
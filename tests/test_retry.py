@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from app.utils import retry
+
+
+def test_execute_with_retry_retries_until_success(monkeypatch: pytest.MonkeyPatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    calls = {"count": 0}
+
+    def flaky() -> str:
+        calls["count"] += 1
+        if calls["count"] < 3:
+            raise RuntimeError("temporary failure")
+        return "ok"
+
+    result = retry.execute_with_retry(flaky, max_attempts=3, base_delay=2, jitter=False)
+
+    assert result == "ok"
+    assert calls["count"] == 3
+    assert sleeps == [2, 4]
+
+
+def test_execute_with_retry_does_not_sleep_past_deadline(monkeypatch: pytest.MonkeyPatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+
+    def always_fails() -> None:
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        retry.execute_with_retry(
+            always_fails,
+            max_attempts=5,
+            base_delay=10,
+            jitter=False,
+            total_deadline=5,
+        )
+
+    assert sleeps == []
+
+
+def test_execute_with_retry_skips_non_retry_exceptions(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda _: None)
+    calls = {"count": 0}
+
+    def invalid() -> None:
+        calls["count"] += 1
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        retry.execute_with_retry(invalid, max_attempts=3, non_retry_exceptions=(ValueError,))
+
+    assert calls["count"] == 1
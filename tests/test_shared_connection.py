@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from models import db_cursor, shared_connection
+
+
+def _insert_user(cur, username: str) -> None:
+    cur.execute(
+        """
+        INSERT INTO users (email, username, password_hash, role, name)
+        VALUES (%s, %s, 'x', 'student', 'Shared Connection');
+        """,
+        (f"{username}@example.com", username),
+    )
+
+
+def _user_exists(username: str) -> bool:
+    with db_cursor() as (conn, cur):
+        cur.execute("SELECT 1 FROM users WHERE username = %s;", (username,))
+        return cur.fetchone() is not None
+
+
+def test_shared_connection_reuses_one_connection(app_context):
+    with shared_connection():
+        with db_cursor() as (first, _):
+            pass
+        with db_cursor() as (second, _):
+            pass
+    assert first is second
+
+
+def test_nested_db_cursor_does_not_commit_the_outer_block(app_context):
+    username = f"nested_{uuid.uuid4().hex[:8]}"
+
+    with pytest.raises(RuntimeError):
+        with shared_connection():
+            with db_cursor() as (conn, cur):
+                _insert_user(cur, username)
+                with db_cursor() as (inner_conn, inner_cur):
+                    assert inner_conn is not conn
+                    inner_cur.execute("SELECT 1;")
+                    inner_conn.commit()
+                raise RuntimeError("outer block failed")
+
+    assert not _user_exists(username)
@@ -227,6 +227,34 @@ def test_student_dashboard_api_returns_expected_payload(
     assert {"practicing", "nearly_mastered"}.issubset(stages)
 
 
+def test_student_dashboard_mastery_includes_words_no_longer_approved(
+    client,
+    student_dashboard_data,
+):
+    student = student_dashboard_data["student"]
+    password = student_dashboard_data["student_password"]
+    practiced_word_id = list_approved_words_for_student(student.id)[1]["id"]
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "UPDATE recommendations SET status = 'rejected' WHERE id = %s",
+            (practiced_word_id,),
+        )
+        conn.commit()
+    finally:
+        cur.close()
+
+    _login_student(client, student.username, password)
+    response = client.get("/api/student/dashboard")
+    assert response.status_code == 200
+
+    payload = response.get_json()
+    assert practiced_word_id not in {entry["id"] for entry in payload["approved_words"]}
+    assert practiced_word_id in {entry["word_id"] for entry in payload["mastery"]}
+
+
 def test_student_dashboard_page_renders(client, student_dashboard_data):
     student = student_dashboard_data["student"]
     password = student_dashboard_data["student_password"]
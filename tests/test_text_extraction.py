@@ -3,6 +3,7 @@ from __future__ import annotations
 import io
 
 import pandas as pd
+import pytest
 from docx import Document
 
 from app.services import text_extraction
@@ -50,3 +51,63 @@ def test_extract_text_rejects_unknown_extension():
     else:  # pragma: no cover - ensure exception raised
         raise AssertionError("UnsupportedFileTypeError not raised")
 
+
+def test_extract_text_uses_the_last_suffix_as_extension():
+    assert text_extraction.extract_text(b"Dotfile text.", ".txt") == "Dotfile text."
+    assert text_extraction.extract_text(b"Mixed case.", "Essay.Final.TXT") == "Mixed case."
+    with pytest.raises(text_extraction.UnsupportedFileTypeError, match="must contain"):
+        text_extraction.extract_text(b"irrelevant", "README")
+
+
+def test_extract_pdf_skips_page_count_without_pool_strategies(monkeypatch, set_env):
+    set_env("PDF_BACKEND", "pdfplumber")
+    set_env("PDF_PARALLEL", "false")
+    set_env("PDF_USE_PROCESS_POOL", "false")
+
+    def fail_page_count(data: bytes) -> int:
+        raise AssertionError("page count should not be read")
+
+    def fake_pages(data: bytes, start: int, stop):
+        yield "First page."
+        yield "Second page."
+
+    monkeypatch.setitem(text_extraction._PDF_BACKENDS, "pdfplumber", (fail_page_count, fake_pages))
+
+    text = text_extraction.extract_text(b"%PDF-1.4", "essay.pdf")
+    assert text == "First page. Second page."
+
+
+def _two_page_pdf() -> bytes:
+    fitz = pytest.importorskip("fitz")
+    document = fitz.open()
+    for line in ("Students analyze the data.", "Then they interpret results."):
+        page = document.new_page()
+        page.insert_text((72, 72), line)
+    try:
+        return document.tobytes()
+    finally:
+        document.close()
+
+
+def test_extract_pdf_with_pymupdf_backend(set_env):
+    data = _two_page_pdf()
+    set_env("PDF_BACKEND", "pymupdf")
+
+    text = text_extraction.extract_text(data, "essay.pdf")
+    assert text == "Students analyze the data. Then they interpret results."
+
+    set_env("PDF_BACKEND", "pdfplumber")
+    assert text_extraction.extract_text(data, "essay.pdf") == text
+
+
+def test_pdf_backend_defaults_to_pymupdf_when_installed(monkeypatch, set_env):
+    monkeypatch.setattr(text_extraction, "fitz", object())
+    set_env("PDF_BACKEND", None)
+    assert text_extraction._pdf_backend() == "pymupdf"
+
+
+@pytest.mark.parametrize("configured", [None, "pymupdf", "pdfplumber", "unknown"])
+def test_pdf_backend_falls_back_to_pdfplumber_without_fitz(monkeypatch, set_env, configured):
+    monkeypatch.setattr(text_extraction, "fitz", None)
+    set_env("PDF_BACKEND", configured)
+    assert text_extraction._pdf_backend() == "pdfplumber"
@@ -13,7 +13,7 @@ class _FakeS3Client:
     def __init__(self) -> None:
         self.uploads: list[tuple[Any, ...]] = []
 
-    def upload_fileobj(self, fileobj, bucket: str, key: str) -> None:
+    def upload_fileobj(self, fileobj, bucket: str, key: str, Config=None) -> None:
         # simulate read for side effects and reset stream
         fileobj.read()
         fileobj.seek(0)
@@ -49,7 +49,7 @@ def educator_and_student(app_context):
 
 
 def test_upload_creates_record_and_queues_job(
-    client, monkeypatch, educator_and_student
+    client, monkeypatch, educator_and_student, set_env
 ) -> None:
     _educator, student = educator_and_student
 
@@ -59,7 +59,7 @@ def test_upload_creates_record_and_queues_job(
             return fake_s3
         raise AssertionError(f"Unsupported service: {service_name}")
 
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
     monkeypatch.setattr("boto3.client", fake_boto_client)
 
     enqueued_ids: list[int] = []
@@ -97,7 +97,7 @@ def test_upload_creates_record_and_queues_job(
     assert status_response.get_json() == {"upload_id": upload_id, "status": "pending"}
 
 
-def test_upload_rejects_invalid_extension(client, monkeypatch, educator_and_student) -> None:
+def test_upload_rejects_invalid_extension(client, monkeypatch, educator_and_student, set_env) -> None:
     _educator, student = educator_and_student
 
     fake_s3 = _FakeS3Client()
@@ -107,7 +107,7 @@ def test_upload_rejects_invalid_extension(client, monkeypatch, educator_and_stud
             return fake_s3
         raise AssertionError(f"Unsupported service: {service_name}")
 
-    monkeypatch.setenv("AWS_S3_BUCKET_NAME", "test-bucket")
+    set_env("AWS_S3_BUCKET_NAME", "test-bucket")
     monkeypatch.setattr("boto3.client", fake_boto_client)
 
     _login_as_educator(client, "uploadteacher", "TeacherPass123!")